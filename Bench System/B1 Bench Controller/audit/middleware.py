@@ -0,0 +1,22 @@
+"""Per-request audit queue (see audit.utils)."""
+from functools import partial
+
+from audit.utils import begin_deferred, end_deferred, flush_deferred
+
+
+class DeferredAuditMiddleware:
+    """Queue the request's audit entries; write them once the response is closed."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        begin_deferred()
+        try:
+            response = self.get_response(request)
+        finally:
+            pending = end_deferred()
+        if pending:
+            # Closers run from response.close(), after the body has been sent
+            response._resource_closers.append(partial(flush_deferred, pending))
+        return response
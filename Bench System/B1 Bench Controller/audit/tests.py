@@ -1,8 +1,13 @@
-from django.test import TestCase
+from contextvars import copy_context
+
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
 
 from accounts.models import CustomUser
+from audit.middleware import DeferredAuditMiddleware
 from audit.models import AuditEntry
-from audit.utils import log_audit
+from audit.utils import begin_deferred, end_deferred, flush_deferred, log_audit
 
 
 class AuditUtilsTest(TestCase):
@@ -42,3 +47,77 @@ class AuditUtilsTest(TestCase):
         log_audit(self.user, 'login', ip_address='192.168.1.100')
         entry = AuditEntry.objects.first()
         self.assertEqual(entry.ip_address, '192.168.1.100')
+
+
+class DeferredAuditTest(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username='auditor', password='test123', role='admin',
+        )
+        self.addCleanup(flush_deferred)
+
+    def test_entries_queued_until_flush(self):
+        begin_deferred()
+        log_audit(self.user, 'create', 'meter', 1)
+        log_audit(None, 'update', 'meter', 1)
+        self.assertEqual(AuditEntry.objects.count(), 0)
+        flush_deferred()
+        self.assertEqual(AuditEntry.objects.count(), 2)
+        self.assertEqual(
+            set(AuditEntry.objects.values_list('action', 'user_id')),
+            {('create', self.user.pk), ('update', None)},
+        )
+
+    def test_writes_synchronously_after_flush(self):
+        begin_deferred()
+        flush_deferred()
+        log_audit(self.user, 'login')
+        self.assertEqual(AuditEntry.objects.count(), 1)
+
+    def test_begin_keeps_an_open_queue(self):
+        begin_deferred()
+        log_audit(self.user, 'create', 'meter', 1)
+        begin_deferred()
+        log_audit(self.user, 'update', 'meter', 1)
+        self.assertEqual(len(end_deferred()), 2)
+
+    def test_interleaved_requests_keep_their_own_queues(self):
+        # Two requests served on one thread, as sync views are under ASGI
+        req_a, req_b = copy_context(), copy_context()
+        req_a.run(begin_deferred)
+        req_a.run(log_audit, self.user, 'create', 'meter', 1)
+        req_b.run(begin_deferred)
+        req_b.run(log_audit, self.user, 'create', 'meter', 2)
+        req_a.run(log_audit, self.user, 'update', 'meter', 1)
+
+        req_a.run(flush_deferred)
+        self.assertEqual(
+            sorted(AuditEntry.objects.values_list('action', 'target_id')),
+            [('create', 1), ('update', 1)],
+        )
+        req_b.run(flush_deferred)
+        self.assertEqual(AuditEntry.objects.filter(target_id=2).count(), 1)
+
+    @override_settings(AUDIT_DEFER_WRITES=False)
+    def test_setting_disables_deferral(self):
+        begin_deferred()
+        log_audit(self.user, 'login')
+        self.assertEqual(AuditEntry.objects.count(), 1)
+
+    def test_request_entries_written_when_response_finishes(self):
+        self.client.post(reverse('accounts:login'), {
+            'username': 'auditor', 'password': 'test123',
+        })
+        self.assertTrue(AuditEntry.objects.filter(action='login', user=self.user).exists())
+
+    def test_middleware_writes_entries_on_response_close(self):
+        def view(request):
+            log_audit(self.user, 'export', 'test')
+            return HttpResponse()
+
+        response = DeferredAuditMiddleware(view)(RequestFactory().get('/'))
+        self.assertEqual(AuditEntry.objects.count(), 0)
+        log_audit(self.user, 'login')  # after the view: written directly
+        self.assertEqual(AuditEntry.objects.count(), 1)
+        response.close()
+        self.assertTrue(AuditEntry.objects.filter(action='export').exists())
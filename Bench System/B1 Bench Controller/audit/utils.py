@@ -1,10 +1,25 @@
 """Audit logging utility."""
 import logging
+from contextvars import ContextVar
+
+from django.conf import settings
 
 from audit.models import AuditEntry
 
 logger = logging.getLogger(__name__)
 
+# Entries logged during a request are queued on that request's own list and
+# bulk-inserted once its response is closed (see audit.middleware), keeping
+# the INSERT off the response path. The list lives in a ContextVar rather
+# than a thread-local: under ASGI every sync view runs on the same thread.
+# Outside a request — or with AUDIT_DEFER_WRITES = False — log_audit()
+# writes synchronously.
+#
+# Queued entries are written after the view returns, outside any
+# transaction.atomic() block they were logged in, so a rollback does not
+# discard them. Log once the block has committed, as the views do.
+_pending = ContextVar('audit_pending', default=None)
+
 
 def log_audit(user, action, target_type='', target_id=None,
               description='', ip_address=None, metadata=None):
@@ -19,15 +34,48 @@ def log_audit(user, action, target_type='', target_id=None,
         ip_address: Client IP address.
         metadata: Additional JSON-serializable data.
     """
+    entry = AuditEntry(
+        user_id=user.pk if user and hasattr(user, 'pk') else None,
+        action=action,
+        target_type=target_type,
+        target_id=target_id,
+        description=description,
+        ip_address=ip_address,
+        metadata=metadata or {},
+    )
+    pending = _pending.get()
+    if pending is not None:
+        pending.append(entry)
+        return
     try:
-        AuditEntry.objects.create(
-            user=user if user and hasattr(user, 'pk') else None,
-            action=action,
-            target_type=target_type,
-            target_id=target_id,
-            description=description,
-            ip_address=ip_address,
-            metadata=metadata or {},
-        )
+        entry.save()
     except Exception:
         logger.debug("Failed to create audit entry", exc_info=True)
+
+
+def begin_deferred():
+    """Start queueing audit entries in the current context (request start).
+
+    An already open queue is kept, never replaced.
+    """
+    if getattr(settings, 'AUDIT_DEFER_WRITES', True) and _pending.get() is None:
+        _pending.set([])
+
+
+def end_deferred():
+    """Stop queueing in the current context; returns the queued entries."""
+    pending = _pending.get()
+    _pending.set(None)
+    return pending
+
+
+def flush_deferred(pending=None):
+    """Bulk-insert `pending`, or end and write the current context's queue."""
+    if pending is None:
+        pending = end_deferred()
+    if not pending:
+        return
+    try:
+        AuditEntry.objects.bulk_create(pending, batch_size=100)
+    except Exception:
+        logger.debug("Failed to write %d audit entries", len(pending), exc_info=True)
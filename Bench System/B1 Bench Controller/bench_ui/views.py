@@ -462,13 +462,14 @@ def system_api_command(request):
                 )
         else:
             from controller.hardware import get_tower_light
+            from controller.tower_light import pack_state
             tower = get_tower_light()
             if action == 'red':
-                tower._apply_state(not snap.tower_red, False, snap.tower_green, snap.buzzer)
+                tower._apply_state(pack_state(not snap.tower_red, False, snap.tower_green, snap.buzzer))
             elif action == 'green':
-                tower._apply_state(snap.tower_red, False, not snap.tower_green, snap.buzzer)
+                tower._apply_state(pack_state(snap.tower_red, False, not snap.tower_green, snap.buzzer))
             elif action == 'buzzer':
-                tower._apply_state(snap.tower_red, False, snap.tower_green, not snap.buzzer)
+                tower._apply_state(pack_state(snap.tower_red, False, snap.tower_green, not snap.buzzer))
 
         # Read fresh state after command
         new_snap = get_sensor_manager().latest
@@ -837,20 +838,22 @@ def test_wizard(request):
             notes=notes,
         )
 
-        # Auto-populate TestResults from ISO 4064 standards
+        # Auto-populate TestResults from ISO 4064 standards in one INSERT
         standards = ISO4064Standard.objects.filter(
             meter_size=meter.meter_size,
             meter_class=meter.meter_class,
         ).order_by('q_point')
 
-        for std in standards:
-            TestResult.objects.create(
+        TestResult.objects.bulk_create([
+            TestResult(
                 test=test,
                 q_point=std.q_point,
                 target_flow_lph=std.flow_rate_lph,
                 mpe_pct=std.mpe_pct,
                 zone=std.zone,
             )
+            for std in standards
+        ])
 
         return redirect('bench_ui:test_control_live', test_id=test.pk)
 
@@ -24,6 +24,11 @@ logger = logging.getLogger(__name__)
 DEFAULT_TIMEOUT = 2.0
 
 
+def encode_command(cmd: dict[str, Any]) -> bytes:
+    """Serialize a command dict to the JSON line sent over the wire."""
+    return (json.dumps(cmd, separators=(',', ':')) + '\n').encode('utf-8')
+
+
 class SerialHandler:
     """Thread-safe JSON serial handler for a single USB-serial bridge."""
 
@@ -99,16 +104,22 @@ class SerialHandler:
         if not self._serial or not self._serial.is_open:
             raise ConnectionError(f"Serial port {self.port} not open")
         old_timeout = self._serial.timeout
-        if timeout is not None:
-            self._serial.timeout = timeout
+        if timeout is None or timeout == old_timeout:
+            # Setting pyserial's timeout reconfigures the port (termios
+            # syscalls), so only swap it when it actually differs.
+            return self._decode_line(self._serial.readline())
+        self._serial.timeout = timeout
         try:
-            line = self._serial.readline()
-            if line:
-                return line.decode('utf-8', errors='replace').strip()
-            return None
+            return self._decode_line(self._serial.readline())
         finally:
             self._serial.timeout = old_timeout
 
+    @staticmethod
+    def _decode_line(line: bytes) -> str | None:
+        if line:
+            return line.decode('utf-8', errors='replace').strip()
+        return None
+
     # ------------------------------------------------------------------
     #  Command API
     # ------------------------------------------------------------------
@@ -133,24 +144,48 @@ class SerialHandler:
             TimeoutError: If no response within timeout.
             ValueError: If response is not valid JSON.
         """
+        return self.send_encoded(encode_command(cmd), timeout, cmd.get('cmd'))
+
+    def send_encoded(
+        self,
+        line: bytes,
+        timeout: float | None = None,
+        name: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Send a pre-serialized command line and wait for JSON response.
+
+        Lets callers reuse the bytes from encode_command() for commands
+        that never change, skipping the per-call JSON encode.
+
+        Args:
+            line: Encoded command, newline-terminated.
+            timeout: Override response timeout (seconds).
+            name: Command name used in error messages.
+
+        Returns:
+            Response dict with at least {"ok": bool}.
+        """
         with self._lock:
             if not self.is_connected:
                 raise ConnectionError(f"Serial port {self.port} not connected")
 
-            # Serialize and send
-            line = json.dumps(cmd, separators=(',', ':')) + '\n'
-            self._send_raw(line.encode('utf-8'))
-            logger.debug("TX [%s]: %s", self.port, line.strip())
+            self._send_raw(line)
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("TX [%s]: %s", self.port,
+                             line.decode('utf-8', errors='replace').strip())
 
             # Wait for response
             t = timeout or self.timeout
             response_str = self._recv_line(timeout=t)
             if response_str is None:
                 raise TimeoutError(
-                    f"No response from {self.port} within {t}s for cmd={cmd.get('cmd')}"
+                    f"No response from {self.port} within {t}s for cmd={name}"
                 )
 
-            logger.debug("RX [%s]: %s", self.port, response_str)
+            if debug:
+                logger.debug("RX [%s]: %s", self.port, response_str)
 
             try:
                 return json.loads(response_str)
@@ -197,6 +232,13 @@ class SerialHandler:
         """Set a GPIO pin HIGH (1) or LOW (0)."""
         return self.send_command({'cmd': 'GPIO_SET', 'pin': pin, 'state': state})
 
+    def tower_set(self, red: int, yellow: int, green: int,
+                  buzzer: int = 0) -> dict[str, Any]:
+        """Set the tower light outputs in a single TOWER command."""
+        return self.send_command({
+            'cmd': 'TOWER', 'r': red, 'y': yellow, 'g': green, 'buz': buzzer,
+        })
+
     def gpio_get(self, pin: str) -> dict[str, Any]:
         """Read a GPIO pin state."""
         return self.send_command({'cmd': 'GPIO_GET', 'pin': pin})
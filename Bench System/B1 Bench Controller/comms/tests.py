@@ -619,10 +619,11 @@ class TestSerialHandlerConvenienceMethods(TestCase):
         self.assertEqual(self.last_cmd['name'], 'SV_DRN')
 
     def test_tower_set_command_format(self):
-        """tower_set sends TOWER with r/g/buz fields."""
-        self.handler.tower_set(1, 0, 1)
+        """tower_set sends TOWER with r/y/g/buz fields."""
+        self.handler.tower_set(1, 0, 0, 1)
         self.assertEqual(self.last_cmd['cmd'], 'TOWER')
         self.assertEqual(self.last_cmd['r'], 1)
+        self.assertEqual(self.last_cmd['y'], 0)
         self.assertEqual(self.last_cmd['g'], 0)
         self.assertEqual(self.last_cmd['buz'], 1)
 
@@ -106,6 +106,7 @@ class SensorManager:
         self._poll_interval = 0.2  # 200ms default
         self._listeners: list[Callable[[SensorSnapshot], None]] = []
         self._scale_power_on = False
+        self._ready = threading.Event()  # Set once the first snapshot lands
 
         # Backend references
         self._simulator = None
@@ -130,6 +131,10 @@ class SensorManager:
         with self._lock:
             return self._latest
 
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Block until the polling loop has published its first snapshot."""
+        return self._ready.wait(timeout)
+
     def add_listener(self, callback: Callable[[SensorSnapshot], None]):
         """Register a callback for new sensor snapshots."""
         self._listeners.append(callback)
@@ -155,6 +160,7 @@ class SensorManager:
             return
         self._poll_interval = poll_interval
         self._init_backend()
+        self._ready.clear()
         self._running = True
         self._thread = threading.Thread(
             target=self._poll_loop,
@@ -181,6 +187,7 @@ class SensorManager:
                 snapshot = self._read_all()
                 with self._lock:
                     self._latest = snapshot
+                self._ready.set()
                 # Notify listeners
                 for cb in self._listeners:
                     try:
@@ -353,26 +360,15 @@ class SensorManager:
         if vfd and vfd.is_connected:
             snap.b2_vfd_online = True
             try:
-                r = vfd.modbus_read(1, 0x2100, 1)
+                # Status block 0x2100..0x2105: status, -, -, freq, current, fault
+                r = vfd.modbus_read(1, 0x2100, 6)
                 if r.get('ok'):
                     values = r.get('data', {}).get('values', [])
-                    if values:
+                    if len(values) >= 6:
                         snap.vfd_running = bool(values[0] & 0x01)
-                r = vfd.modbus_read(1, 0x2103, 1)
-                if r.get('ok'):
-                    values = r.get('data', {}).get('values', [])
-                    if values:
-                        snap.vfd_freq_hz = values[0] / 100.0
-                r = vfd.modbus_read(1, 0x2104, 1)
-                if r.get('ok'):
-                    values = r.get('data', {}).get('values', [])
-                    if values:
-                        snap.vfd_current_a = values[0] / 100.0
-                r = vfd.modbus_read(1, 0x2105, 1)
-                if r.get('ok'):
-                    values = r.get('data', {}).get('values', [])
-                    if values:
-                        snap.vfd_fault = values[0]
+                        snap.vfd_freq_hz = values[3] / 100.0
+                        snap.vfd_current_a = values[4] / 100.0
+                        snap.vfd_fault = values[5]
             except Exception:
                 logger.debug("VFD read failed")
 
@@ -120,12 +120,18 @@ class HardwareSimulator:
     #  Physics update (call periodically or before reading sensors)
     # ------------------------------------------------------------------
 
-    def update(self):
-        """Advance the simulation by elapsed wall-clock time."""
+    def update(self, min_dt: float = 0.0):
+        """
+        Advance the simulation by elapsed wall-clock time.
+
+        Args:
+            min_dt: Skip the step if less than this many seconds have passed
+                since the last one; the time carries over to the next step.
+        """
         with self._lock:
             now = time.time()
             dt = now - self._last_update
-            if dt <= 0:
+            if dt <= 0 or dt < min_dt:
                 return
             self._last_update = now
 
@@ -522,12 +528,22 @@ class HardwareSimulator:
         self.update()
         addr = cmd.get('addr', 0)
         reg = cmd.get('reg', 0)
+        count = cmd.get('count', 1)
 
         with self._lock:
             # VFD (addr 1, high register range 0x2000+) — B2 channel
             if addr == 1 and reg >= 0x2000:
                 if reg == 0x2100:
                     status = 0x01 if self.vfd_running else 0x00
+                    if count > 1:
+                        # Block read of the contiguous status registers 0x2100..0x2105
+                        block = [
+                            status, 0, 0,
+                            int(self.vfd_actual_freq * 100),
+                            int(max(0, self.vfd_current) * 100),
+                            self.vfd_fault,
+                        ]
+                        return {'ok': True, 'data': {'values': block[:count]}}
                     return {'ok': True, 'data': {'values': [status]}}
                 elif reg == 0x2103:
                     return {'ok': True, 'data': {'values': [int(self.vfd_actual_freq * 100)]}}
@@ -625,11 +641,14 @@ class HardwareSimulator:
     def _handle_tower_cmd(self, cmd: dict) -> dict:
         """Simulate TOWER command (B5)."""
         r = cmd.get('r', -1)
+        y = cmd.get('y', -1)
         g = cmd.get('g', -1)
         buz = cmd.get('buz', -1)
         with self._lock:
             if r >= 0:
                 self.tower_red = bool(r)
+            if y >= 0:
+                self.tower_yellow = bool(y)
             if g >= 0:
                 self.tower_green = bool(g)
             if buz >= 0:
@@ -105,6 +105,7 @@ class TestStateMachine:
         self._state = TestState.IDLE
         self._thread: threading.Thread | None = None
         self._lock = threading.RLock()
+        self._state_cv = threading.Condition(self._lock)
 
         # Abort mechanism
         self._abort_requested = False
@@ -114,6 +115,10 @@ class TestStateMachine:
         self._manual_dut_event = threading.Event()
         self._manual_dut_callbacks: list = []
 
+        # Progress events for in-process observers (tests, UI bridges)
+        self._q_transition_event = threading.Event()
+        self._manual_dut_entered_event = threading.Event()
+
         # Sensor recording throttle
         self._last_sensor_record = 0.0
 
@@ -234,6 +239,8 @@ class TestStateMachine:
 
             for q_idx in range(len(self._q_points)):
                 self._current_q_idx = q_idx
+                if q_idx > 0:
+                    self._q_transition_event.set()
                 q = self._q_points[q_idx]
                 self._state_flow_stabilize(q)
                 self._state_tare_scale()
@@ -310,8 +317,9 @@ class TestStateMachine:
         if self._dut.mode != dut_mode:
             self._dut.set_mode(dut_mode)
 
-        # Register safety alarm callback
+        # Register safety alarm and VFD fault callbacks
         self._safety.on_alarm(self._on_safety_alarm)
+        self._vfd.on_fault_change(self._on_vfd_fault)
 
         # Start the test
         start_test(self._test)
@@ -338,7 +346,7 @@ class TestStateMachine:
         if snap.timestamp == 0:
             raise PreCheckError("Sensor manager has no data")
 
-        vfd_status = self._vfd.read_status()
+        vfd_status = self._vfd.read_status(force=True)
         if vfd_status.faulted:
             raise PreCheckError(f"VFD fault code {vfd_status.fault_code}")
         if not vfd_status.connected:
@@ -646,6 +654,7 @@ class TestStateMachine:
             except Exception:
                 logger.exception("Manual DUT callback error")
 
+        self._manual_dut_entered_event.set()
         logger.info("Test #%d waiting for manual DUT %s for %s",
                     self._test_id, reading_type, q_point)
 
@@ -664,8 +673,9 @@ class TestStateMachine:
     # ==================================================================
 
     def _set_state(self, state: TestState):
-        with self._lock:
+        with self._state_cv:
             self._state = state
+            self._state_cv.notify_all()
 
     def _check_abort(self):
         with self._lock:
@@ -737,12 +747,21 @@ class TestStateMachine:
         if alarm.severity == AlarmSeverity.EMERGENCY:
             self.abort(f"Safety alarm: {alarm.message}")
 
+    def _on_vfd_fault(self, old_code: int, new_code: int):
+        if new_code:
+            self.abort(f"VFD fault code {new_code}")
+
     def _cleanup(self):
+        # Wake any observers still waiting on a transition that won't come
+        self._q_transition_event.set()
+        self._manual_dut_entered_event.set()
         if self._safety:
             try:
                 self._safety._callbacks.remove(self._on_safety_alarm)
             except (ValueError, AttributeError):
                 pass
+        if self._vfd:
+            self._vfd.remove_fault_callback(self._on_vfd_fault)
         logger.info("Test #%d state machine finished (state=%s)",
                     self._test_id, self._state.value)
 
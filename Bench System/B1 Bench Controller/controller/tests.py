@@ -8,10 +8,17 @@ Unit tests for Sprint 3 controller modules:
   - DUT interface reading logic
 
 Run: python manage.py test controller --settings=config.settings_bench
+
+Add --keepdb on reruns to reuse the test database instead of rebuilding
+and migrating it; the ISO seed helpers use get_or_create, so they are
+safe against a kept database:
+    python manage.py test controller.tests controller.tests_integration --keepdb --settings=config.settings_bench
 """
 
+import json
 import threading
 import time
+from unittest.mock import MagicMock, Mock, patch, PropertyMock
 
 from django.test import TestCase, override_settings
 
@@ -22,9 +29,12 @@ from controller.safety_monitor import (
     SafetyAlarm,
     SafetyMonitor,
 )
-from controller.sensor_manager import SensorSnapshot
+from controller.sensor_manager import SensorManager, SensorSnapshot
 from controller.valve_controller import ValveController, LANE_VALVES, ALL_VALVES
-from controller.tower_light import TowerLightController, LightPattern, PATTERN_MAP
+from controller.tower_light import (
+    TowerLightController, LightPattern, PATTERN_MAP,
+    BLINK_INTERVAL, RED, YELLOW, GREEN, BUZZER, ALL_OFF, pack_state,
+)
 from controller.gravimetric import GravimetricEngine, GravimetricResult
 from controller.dut_interface import DUTInterface, DUTMode, DUTState
 from controller.simulator import HardwareSimulator
@@ -450,6 +460,21 @@ class TowerLightTests(TestCase):
     def tearDown(self):
         self.tower.stop()
 
+    def _stepped_scheduler(self):
+        """Swap in a blink scheduler on a fake clock, stepped by _advance()."""
+        from controller import tower_light
+        self.now = 0.0
+        scheduler = tower_light._BlinkScheduler(clock=lambda: self.now, autostart=False)
+        patcher = patch.object(tower_light, '_blink_scheduler', scheduler)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return scheduler
+
+    def _advance(self, scheduler, intervals=1):
+        """Move the fake clock on and run what is due; returns writes made."""
+        self.now += BLINK_INTERVAL * intervals
+        return scheduler.run_pending()
+
     def test_ready_pattern(self):
         """READY pattern sets green light."""
         self.tower.set_pattern(LightPattern.READY)
@@ -488,12 +513,137 @@ class TowerLightTests(TestCase):
         """Every LightPattern has a corresponding PATTERN_MAP entry."""
         for pattern in LightPattern:
             self.assertIn(pattern, PATTERN_MAP)
-
-    def test_blink_pattern_starts_thread(self):
-        """Blink patterns start a background thread."""
+            n = len(PATTERN_MAP[pattern])
+            self.assertEqual(n & (n - 1), 0, f"{pattern} length {n} not a power of two")
+            self.assertEqual(pattern.states, tuple(PATTERN_MAP[pattern]))
+            self.assertEqual(pattern.is_blink, n > 1)
+
+    def test_pack_state_bits(self):
+        """pack_state places each output on its own bit."""
+        self.assertEqual(pack_state(True, False, False, False), RED)
+        self.assertEqual(pack_state(False, True, False, False), YELLOW)
+        self.assertEqual(pack_state(False, False, True, False), GREEN)
+        self.assertEqual(pack_state(False, False, False, True), BUZZER)
+        self.assertEqual(pack_state(True, True, True, True), RED | YELLOW | GREEN | BUZZER)
+
+    def test_real_backend_single_tower_command(self):
+        """Real backend drives all outputs with one TOWER command, skipping repeats."""
+        tower = TowerLightController(backend='real')
+        handler = MagicMock()
+        tower.set_serial_handler(handler)
+
+        tower._apply_state(YELLOW)
+        tower._apply_state(YELLOW)
+        handler.tower_set.assert_called_once_with(0, 1, 0, 0)
+        handler.gpio_set.assert_not_called()
+
+        tower._apply_state(RED | BUZZER)
+        handler.tower_set.assert_called_with(1, 0, 0, 1)
+        self.assertEqual(handler.tower_set.call_count, 2)
+
+    def test_real_backend_dedups_pattern_changes(self):
+        """Patterns whose first state is already on the lights send nothing; all_off always sends."""
+        tower = TowerLightController(backend='real')
+        handler = MagicMock()
+        tower.set_serial_handler(handler)
+
+        tower.set_pattern(LightPattern.FAULT)
+        tower.set_pattern(LightPattern.ESTOP)  # starts on RED, already lit
+        tower._stop_blink()
+        self.assertEqual(handler.tower_set.call_count, 1)
+
+        tower.all_off()
+        tower.all_off()
+        self.assertEqual(handler.tower_set.call_count, 3)
+
+    def test_blink_pattern_scheduled(self):
+        """Blink patterns run on the shared scheduler and are cancelled on change."""
+        scheduler = self._stepped_scheduler()
+        sim = self.tower._simulator
         self.tower.set_pattern(LightPattern.ESTOP)
-        self.assertIsNotNone(self.tower._blink_thread)
-        self.assertTrue(self.tower._blink_running)
+        entry = self.tower._blink_entry
+        self.assertIsNotNone(entry)
+        self.assertEqual(scheduler.run_pending(), 1)  # first state at once
+        self.assertTrue(sim.tower_red)
+        self.assertEqual(self._advance(scheduler), 1)
+        self.assertFalse(sim.tower_red)
+
+        self.tower.set_pattern(LightPattern.READY)
+        self.assertIsNone(self.tower._blink_entry)
+        self.assertTrue(entry[-1])  # tombstoned
+        self.assertEqual(self._advance(scheduler, 3), 0)
+        self.assertTrue(sim.tower_green)
+        self.assertFalse(sim.tower_red)
+
+    def test_blink_toggles_once_per_interval(self):
+        """Each blink interval makes exactly one write, alternating states."""
+        scheduler = self._stepped_scheduler()
+        writes = []
+        scheduler.schedule(writes.append, (RED, ALL_OFF))
+        self.assertEqual(scheduler.run_pending(), 1)
+        self.assertEqual(scheduler.run_pending(), 0)  # not due again yet
+        for _ in range(4):
+            self.assertEqual(self._advance(scheduler), 1)
+        self.assertEqual(writes, [RED, ALL_OFF, RED, ALL_OFF, RED])
+
+    def test_blink_cancel_bounded_when_write_stalls(self):
+        """A stuck blink write cannot block cancel() past CANCEL_TIMEOUT_S."""
+        from controller import tower_light
+        release = threading.Event()
+        entered = threading.Event()
+        calls = []
+
+        def stuck(bits):
+            calls.append(bits)
+            entered.set()
+            release.wait(5)
+
+        with patch.object(tower_light, 'CANCEL_TIMEOUT_S', 0.05):
+            entry = tower_light._blink_scheduler.schedule(stuck, (RED, 0))
+            self.assertTrue(entered.wait(2))
+            with self.assertLogs('controller.tower_light', 'WARNING'):
+                self.assertFalse(tower_light._blink_scheduler.cancel(entry))
+        release.set()
+        # Returns once the stuck write finishes; the entry is not rescheduled
+        self.assertTrue(tower_light._blink_scheduler.cancel(entry))
+        self.assertNotIn(entry, tower_light._blink_scheduler._heap)
+        self.assertEqual(calls, [RED])
+
+    def test_stalled_blink_write_does_not_block_other_patterns(self):
+        """Writes run outside the scheduler lock: schedule()/cancel() of
+        other patterns return while one write is stuck."""
+        from controller import tower_light
+        scheduler = tower_light._blink_scheduler
+        release = threading.Event()
+        entered = threading.Event()
+
+        def stuck(bits):
+            entered.set()
+            release.wait(5)
+
+        stalled = scheduler.schedule(stuck, (RED, 0))
+        try:
+            self.assertTrue(entered.wait(2))
+            other = scheduler.schedule(lambda bits: None, (GREEN, 0))
+            self.assertTrue(scheduler.cancel(other))
+            self.assertIs(scheduler._in_flight, stalled)  # still stuck throughout
+        finally:
+            release.set()
+            self.assertTrue(scheduler.cancel(stalled))
+
+    def test_blink_stop_is_immediate(self):
+        """Changing pattern stops the old blink at once; it never writes again."""
+        scheduler = self._stepped_scheduler()
+        sim = self.tower._simulator
+        self.tower.set_pattern(LightPattern.TEST_FAIL)
+        scheduler.run_pending()
+        self.assertTrue(sim.buzzer)
+
+        self.tower.set_pattern(LightPattern.TESTING)
+        self.assertEqual(self._advance(scheduler, 3), 0)
+        self.assertTrue(sim.tower_yellow)
+        self.assertFalse(sim.tower_red)
+        self.assertFalse(sim.buzzer)
 
 
 # ======================================================================
@@ -621,11 +771,136 @@ class DUTSimulatorModeTests(TestCase):
         self.assertAlmostEqual(reading.volume_l, 10.5, places=1)
 
 
+# ======================================================================
+#  Simulator Tests
+# ======================================================================
+
+class SimulatorStepTests(TestCase):
+    """Simulator physics stepping."""
+
+    def test_update_min_dt_defers_step(self):
+        """Steps shorter than min_dt are skipped and the time carries over."""
+        sim = HardwareSimulator()
+        sim.vfd_start(30.0)
+        sim._last_update = time.time()
+        sim.update(min_dt=10.0)
+        self.assertEqual(sim.vfd_actual_freq, 0.0)
+        sim._last_update -= 0.2
+        sim.update(min_dt=0.1)
+        self.assertGreater(sim.vfd_actual_freq, 0.0)
+
+
+# ======================================================================
+#  VFD Controller Tests
+# ======================================================================
+
+class _SimSerial:
+    """Serial handler stand-in that routes Modbus reads to the simulator."""
+
+    is_connected = True
+
+    def __init__(self, sim):
+        self.sim = sim
+        self.reads = []
+        self.writes = []
+
+    def modbus_read(self, bus, addr, reg, count=1):
+        self.reads.append((reg, count))
+        return self.sim.process_command(
+            {'cmd': 'MB_READ', 'addr': addr, 'reg': reg, 'count': count},
+        )
+
+    def modbus_write(self, bus, addr, reg, value):
+        self.writes.append(('live', reg, value))
+        return self.sim.process_command(
+            {'cmd': 'MB_WRITE', 'addr': addr, 'reg': reg, 'value': value},
+        )
+
+    def send_encoded(self, line, timeout=None, name=None):
+        cmd = json.loads(line)
+        self.writes.append(('encoded', cmd['reg'], cmd['value']))
+        return self.sim.process_command(cmd)
+
+
+class VFDRealStatusTests(TestCase):
+    """VFD status decoding on the real (serial) backend."""
+
+    def setUp(self):
+        from controller.vfd_controller import VFDController
+        self.sim = HardwareSimulator()
+        self.serial = _SimSerial(self.sim)
+        self.vfd = VFDController(backend='real')
+        self.vfd.set_serial_handler(self.serial)
+
+    def test_status_block_single_read(self):
+        """All status registers come from one block read."""
+        self.sim.vfd_start(30.0)
+        self.sim.vfd_fault = 7
+        status = self.vfd.read_status()
+        self.assertEqual(len(self.serial.reads), 1)
+        self.assertEqual(self.serial.reads[0], (0x2100, 6))
+        self.assertTrue(status.running)
+        self.assertEqual(status.fault_code, 7)
+        self.assertAlmostEqual(status.frequency_hz, int(self.sim.vfd_actual_freq * 100) / 100.0)
+
+    def test_status_cached_within_poll_interval(self):
+        """Back-to-back reads reuse the snapshot unless forced."""
+        self.vfd.read_status()
+        self.vfd.read_status()
+        self.assertEqual(len(self.serial.reads), 1)
+        self.vfd.read_status(force=True)
+        self.assertEqual(len(self.serial.reads), 2)
+
+    def test_fault_change_callback(self):
+        """Fault callbacks fire on transitions only."""
+        changes = []
+
+        def record(old, new):
+            changes.append((old, new))
+
+        self.vfd.on_fault_change(record)
+        self.vfd.read_status(force=True)
+        self.sim.vfd_fault = 7
+        self.vfd.read_status(force=True)
+        self.vfd.read_status(force=True)
+        self.sim.vfd_fault = 0
+        self.vfd.read_status(force=True)
+        self.assertEqual(changes, [(0, 7), (7, 0)])
+
+        self.vfd.remove_fault_callback(record)
+        self.sim.vfd_fault = 3
+        self.vfd.read_status(force=True)
+        self.assertEqual(changes, [(0, 7), (7, 0)])
+
+    def test_common_writes_use_precomputed_lines(self):
+        """Fixed control words and table setpoints skip the live encode."""
+        self.assertTrue(self.vfd.start(30.0))
+        self.assertTrue(self.vfd.stop())
+        self.assertEqual(self.serial.writes, [
+            ('encoded', 0x2001, 3000),
+            ('encoded', 0x2000, 0x0001),
+            ('encoded', 0x2000, 0x0005),
+        ])
+
+    def test_tenth_hz_setpoint_from_table(self):
+        """0.1 Hz setpoints come from the table, rounded not truncated."""
+        self.assertTrue(self.vfd.set_frequency(33.3))
+        self.assertTrue(self.vfd.set_frequency(50.0))
+        self.assertEqual(self.serial.writes, [
+            ('encoded', 0x2001, 3330),
+            ('encoded', 0x2001, 5000),
+        ])
+
+    def test_off_table_setpoint_written_live(self):
+        """Setpoints finer than 0.1 Hz fall back to a live write."""
+        self.assertTrue(self.vfd.set_frequency(33.33))
+        self.assertEqual(self.serial.writes, [('live', 0x2001, 3333)])
+
+
 # ======================================================================
 #  State Machine Tests (T-401)
 # ======================================================================
 
-from unittest.mock import MagicMock, patch, PropertyMock
 from dataclasses import dataclass as _dc
 
 from meters.models import TestMeter
@@ -635,7 +910,16 @@ from controller.state_machine import (
     QPointParams, start_test_machine, get_active_machine, abort_active_test,
     FLOW_STABILIZE_TIMEOUT_S, PUMP_CONFIRM_TIMEOUT_S,
 )
-from controller.vfd_controller import VFDStatus
+from controller.vfd_controller import VFDController, VFDStatus
+
+
+@_dc(slots=True, frozen=True)
+class _FakeReading:
+    """Minimal stand-in for DUTReading returned by the mocked DUT."""
+    volume_l: float
+    before_l: float = 100.0
+    after_l: float = 101.0
+    is_valid: bool = True
 
 
 def _make_mock_snapshot(**overrides):
@@ -682,30 +966,22 @@ def _seed_iso4064():
 class StateMachineTestBase(TestCase):
     """Base with common fixtures and mocks for state machine tests."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         _seed_iso4064()
-        self.meter = TestMeter.objects.create(
-            serial_number='SM-TEST-001',
-            meter_size='DN15',
-            meter_class='B',
-            meter_type='mechanical',
-            dut_mode='rs485',
-        )
-        self.test = Test.objects.create(
-            meter=self.meter, test_class='B', status='queued',
-        )
-        for iso in ISO4064Standard.objects.filter(meter_size='DN15', meter_class='B'):
-            TestResult.objects.create(
-                test=self.test, q_point=iso.q_point,
-                target_flow_lph=iso.flow_rate_lph,
-                mpe_pct=iso.mpe_pct, zone=iso.zone,
-            )
+        cls._iso_specs = list(ISO4064Standard.objects.filter(
+            meter_size='DN15', meter_class='B',
+        ).values('q_point', 'flow_rate_lph', 'mpe_pct', 'zone'))
+
+    def _reset_mocks(self):
+        """Clear recorded calls and restore the default mock behaviours."""
+        for mock in (self.mock_sensor, self.mock_vfd, self.mock_valves,
+                     self.mock_pid, self.mock_safety, self.mock_tower,
+                     self.mock_grav, self.mock_dut):
+            mock.reset_mock(return_value=True, side_effect=True)
 
-        # Build mock controllers
-        self.mock_sensor = MagicMock()
         self.mock_sensor.latest = _make_mock_snapshot()
 
-        self.mock_vfd = MagicMock()
         self.mock_vfd.start.return_value = True
         self.mock_vfd.stop.return_value = True
         self.mock_vfd.set_frequency.return_value = True
@@ -714,7 +990,6 @@ class StateMachineTestBase(TestCase):
             current_a=4.0, fault_code=0, connected=True,
         )
 
-        self.mock_valves = MagicMock()
         self.mock_valves.select_lane.return_value = True
         self.mock_valves.open_valve.return_value = True
         self.mock_valves.set_diverter.return_value = True
@@ -722,17 +997,12 @@ class StateMachineTestBase(TestCase):
         self.mock_valves.active_lane = 'BV-L3'
         self.mock_valves.diverter_position = 'BYPASS'
 
-        self.mock_pid = MagicMock()
         self.mock_pid.is_stable = True
         self.mock_pid.compute.return_value = 25.0
 
-        self.mock_safety = MagicMock()
         self.mock_safety.check_snapshot.return_value = []
         self.mock_safety._callbacks = []
 
-        self.mock_tower = MagicMock()
-
-        self.mock_grav = MagicMock()
         self.mock_grav.tare.return_value = True
         self.mock_grav.start_collection.return_value = None
         self.mock_grav.stop_collection_and_measure.return_value = GravimetricResult(
@@ -743,32 +1013,63 @@ class StateMachineTestBase(TestCase):
         )
         self.mock_grav.drain_tank.return_value = True
 
-        self.mock_dut = MagicMock()
         self.mock_dut.mode = DUTMode.RS485
         self.mock_dut.is_connected.return_value = True
         self.mock_dut.read_before.return_value = 100.0
         self.mock_dut.read_after.return_value = 101.0
-        self.mock_dut.get_reading.return_value = MagicMock(
-            volume_l=1.0, before_l=100.0, after_l=101.0, is_valid=True,
-        )
+        self.mock_dut.get_reading.return_value = _FakeReading(volume_l=1.0)
 
-        # Patch all hardware factory functions
-        self.patches = [
-            patch('controller.hardware.get_sensor_manager', return_value=self.mock_sensor),
-            patch('controller.hardware.get_vfd_controller', return_value=self.mock_vfd),
-            patch('controller.hardware.get_valve_controller', return_value=self.mock_valves),
-            patch('controller.hardware.get_pid_controller', return_value=self.mock_pid),
-            patch('controller.hardware.get_safety_monitor', return_value=self.mock_safety),
-            patch('controller.hardware.get_tower_light', return_value=self.mock_tower),
-            patch('controller.hardware.get_gravimetric_engine', return_value=self.mock_grav),
-            patch('controller.hardware.get_dut_interface', return_value=self.mock_dut),
-        ]
-        for p in self.patches:
-            p.start()
+    def setUp(self):
+        self.meter = TestMeter.objects.create(
+            serial_number='SM-TEST-001',
+            meter_size='DN15',
+            meter_class='B',
+            meter_type='mechanical',
+            dut_mode='rs485',
+        )
+        self.test = Test.objects.create(
+            meter=self.meter, test_class='B', status='queued',
+        )
+        TestResult.objects.bulk_create([
+            TestResult(
+                test=self.test, q_point=spec['q_point'],
+                target_flow_lph=spec['flow_rate_lph'],
+                mpe_pct=spec['mpe_pct'], zone=spec['zone'],
+            )
+            for spec in self._iso_specs
+        ])
+
+        # Fresh mocks per test: a state machine thread that outlives its
+        # test must not touch the next test's mocks
+        self.mock_sensor = Mock(spec=SensorManager)
+        self.mock_vfd = Mock(spec=VFDController)
+        self.mock_valves = Mock(spec=ValveController)
+        self.mock_pid = Mock(spec=PIDController)
+        self.mock_safety = Mock(spec=SafetyMonitor)
+        self.mock_tower = Mock(spec=TowerLightController)
+        self.mock_grav = Mock(spec=GravimetricEngine)
+        self.mock_dut = Mock(spec=DUTInterface)
+        self._reset_mocks()
+
+        # Patch all hardware factory functions; undone by addCleanup
+        factories = {
+            'get_sensor_manager': self.mock_sensor,
+            'get_vfd_controller': self.mock_vfd,
+            'get_valve_controller': self.mock_valves,
+            'get_pid_controller': self.mock_pid,
+            'get_safety_monitor': self.mock_safety,
+            'get_tower_light': self.mock_tower,
+            'get_gravimetric_engine': self.mock_grav,
+            'get_dut_interface': self.mock_dut,
+        }
+        patcher = patch.multiple(
+            'controller.hardware',
+            **{name: Mock(return_value=mock) for name, mock in factories.items()},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def tearDown(self):
-        for p in self.patches:
-            p.stop()
         # Reset module-level state
         import controller.state_machine as sm_mod
         with sm_mod._active_lock:
@@ -828,46 +1129,45 @@ class TestPreCheck(StateMachineTestBase):
         sm._db_safe(sm._state_pre_check)
         # Should complete without error
 
-    def test_pre_check_safety_alarm_aborts(self):
-        """Emergency alarm triggers PreCheckError."""
+    def test_pre_check_abort_cases(self):
+        """Each unhealthy condition raises PreCheckError naming the cause."""
         sm = self._init_sm()
-        self.mock_safety.check_snapshot.return_value = [
-            SafetyAlarm(
-                code=AlarmCode.ESTOP_ACTIVE,
-                severity=AlarmSeverity.EMERGENCY,
-                message='E-stop active',
+
+        def _safety_alarm():
+            self.mock_safety.check_snapshot.return_value = [
+                SafetyAlarm(
+                    code=AlarmCode.ESTOP_ACTIVE,
+                    severity=AlarmSeverity.EMERGENCY,
+                    message='E-stop active',
+                )
+            ]
+
+        def _vfd_fault():
+            self.mock_vfd.read_status.return_value = VFDStatus(
+                running=False, frequency_hz=0, target_hz=0,
+                current_a=0, fault_code=5, connected=True,
             )
-        ]
-        with self.assertRaises(PreCheckError) as ctx:
-            sm._db_safe(sm._state_pre_check)
-        self.assertIn('E-stop', str(ctx.exception))
 
-    def test_pre_check_vfd_fault_aborts(self):
-        """VFD fault code raises PreCheckError."""
-        sm = self._init_sm()
-        self.mock_vfd.read_status.return_value = VFDStatus(
-            running=False, frequency_hz=0, target_hz=0,
-            current_a=0, fault_code=5, connected=True,
-        )
-        with self.assertRaises(PreCheckError) as ctx:
-            sm._db_safe(sm._state_pre_check)
-        self.assertIn('fault', str(ctx.exception).lower())
+        def _low_reservoir():
+            self.mock_sensor.latest = _make_mock_snapshot(reservoir_level_pct=20.0)
 
-    def test_pre_check_low_reservoir_aborts(self):
-        """Low reservoir level raises PreCheckError."""
-        sm = self._init_sm()
-        self.mock_sensor.latest = _make_mock_snapshot(reservoir_level_pct=20.0)
-        with self.assertRaises(PreCheckError) as ctx:
-            sm._db_safe(sm._state_pre_check)
-        self.assertIn('Reservoir', str(ctx.exception))
+        def _dut_disconnected():
+            self.mock_dut.is_connected.return_value = False
 
-    def test_pre_check_dut_disconnected_rs485_aborts(self):
-        """DUT not connected in RS485 mode raises PreCheckError."""
-        sm = self._init_sm()
-        self.mock_dut.is_connected.return_value = False
-        with self.assertRaises(PreCheckError) as ctx:
-            sm._db_safe(sm._state_pre_check)
-        self.assertIn('DUT', str(ctx.exception))
+        cases = [
+            ('safety_alarm', _safety_alarm, 'E-stop'),
+            ('vfd_fault', _vfd_fault, 'VFD fault'),
+            ('low_reservoir', _low_reservoir, 'Reservoir'),
+            ('dut_disconnected_rs485', _dut_disconnected, 'DUT'),
+        ]
+        for name, mutate, expected in cases:
+            with self.subTest(case=name):
+                # Healthy defaults first, so a failed case can't leak into the next
+                self._reset_mocks()
+                mutate()
+                with self.assertRaises(PreCheckError) as ctx:
+                    sm._db_safe(sm._state_pre_check)
+                self.assertIn(expected, str(ctx.exception))
 
 
 class TestPumpStart(StateMachineTestBase):
@@ -961,6 +1261,21 @@ class TestAbort(StateMachineTestBase):
         sm._on_safety_alarm(alarm)
         self.assertTrue(sm._abort_requested)
 
+    def test_vfd_fault_callback_triggers_abort(self):
+        """A new VFD fault aborts; a cleared one does not. Unhooked on cleanup."""
+        sm = self._make_sm()
+        sm._db_safe(sm._initialize)
+        self.mock_vfd.on_fault_change.assert_called_once_with(sm._on_vfd_fault)
+
+        sm._on_vfd_fault(5, 0)
+        self.assertFalse(sm._abort_requested)
+        sm._on_vfd_fault(0, 5)
+        self.assertTrue(sm._abort_requested)
+        self.assertIn('VFD fault code 5', sm._abort_reason)
+
+        sm._cleanup()
+        self.mock_vfd.remove_fault_callback.assert_called_once_with(sm._on_vfd_fault)
+
 
 class TestComplete(StateMachineTestBase):
 
@@ -1000,9 +1315,8 @@ class TestComplete(StateMachineTestBase):
             success=True, net_weight_kg=1.0, temperature_c=22.0,
             volume_l=1.0, collect_time_s=60.0,
         )
-        self.mock_dut.get_reading.return_value = MagicMock(
-            volume_l=5.0,  # Huge DUT volume → big error → FAIL
-        )
+        # Huge DUT volume → big error → FAIL
+        self.mock_dut.get_reading.return_value = _FakeReading(volume_l=5.0)
         self.mock_sensor.latest = _make_mock_snapshot(weight_kg=100.0)
 
         import controller.state_machine as sm_mod
@@ -1080,6 +1394,7 @@ class TestManualDUT(StateMachineTestBase):
             with self.assertRaises(AbortError) as ctx:
                 sm._request_manual_dut('Q1', 'before')
             self.assertIn('timeout', str(ctx.exception).lower())
+            self.assertTrue(sm._manual_dut_entered_event.is_set())
         finally:
             sm_mod.MANUAL_DUT_TIMEOUT_S = orig
 
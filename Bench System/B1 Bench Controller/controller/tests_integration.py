@@ -13,13 +13,20 @@ needs to see committed data in the database.
 
 Run:
     python manage.py test controller.tests_integration --settings=config.settings_bench -v2
+
+    # Reruns: reuse the test DB (TransactionTestCase still truncates tables)
+    python manage.py test controller.tests_integration --keepdb --settings=config.settings_bench -v2
+
+    # Mostly waiting on the simulator: run classes in parallel worker
+    # processes, each with its own cloned test DB
+    python manage.py test controller.tests_integration --parallel 4 --settings=config.settings_bench
 """
 
 import os
 import tempfile
 import time
 
-from django.test import TransactionTestCase, override_settings
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
 
 from meters.models import TestMeter
 from testing.models import Test, TestResult, ISO4064Standard
@@ -95,6 +102,25 @@ def _create_test_fixtures(dut_mode='rs485'):
     return meter, test
 
 
+# Columns the result assertions read; keeps the fetched rows narrow
+_RESULT_FIELDS = ('q_point', 'ref_volume_l', 'dut_volume_l', 'error_pct', 'passed')
+
+_TERMINAL_STATES = (sm_module.TestState.COMPLETE, sm_module.TestState.EMERGENCY_STOP)
+
+
+def _wait_for_state(machine, predicate, timeout=60):
+    """Block until predicate() holds or the machine reaches a terminal state.
+
+    Waits on the state machine's condition variable, so it returns as soon
+    as the transition happens without polling the Test row.
+    """
+    with machine._state_cv:
+        return machine._state_cv.wait_for(
+            lambda: predicate() or machine.state in _TERMINAL_STATES,
+            timeout=timeout,
+        )
+
+
 def _reset_singletons():
     """Reset all hardware singletons and the active state machine."""
     hw_module.stop_all()
@@ -123,7 +149,10 @@ class _IntegrationBase(TransactionTestCase):
         sim = hw_module.get_simulator()
         sim.connect_dut(error_pct=self.dut_error_pct)
         hw_module.start_all()
-        time.sleep(0.5)
+        self.assertTrue(
+            hw_module.get_sensor_manager().wait_ready(timeout=5),
+            "SensorManager produced no data within 5s",
+        )
 
     def tearDown(self):
         _reset_singletons()
@@ -150,8 +179,13 @@ class TestFullCycleCompletes(_IntegrationBase):
         self.assertIsNotNone(self.test.completed_at)
 
         # Verify Q-point results are populated
-        results = TestResult.objects.filter(test=self.test).order_by('q_point')
-        self.assertEqual(results.count(), 2)
+        results = list(
+            TestResult.objects
+            .filter(test=self.test)
+            .only(*_RESULT_FIELDS)
+            .order_by('q_point')
+        )
+        self.assertEqual(len(results), 2)
 
         for r in results:
             self.assertIsNotNone(r.ref_volume_l, f"{r.q_point}: ref_volume should be set")
@@ -174,7 +208,9 @@ class TestAbortDuringCycle(_IntegrationBase):
         machine = sm_module.start_test_machine(self.test.pk)
 
         # Wait for machine to enter an active state
-        time.sleep(2.0)
+        _wait_for_state(
+            machine, lambda: machine.state == sm_module.TestState.FLOW_STABILIZE,
+        )
         self.assertTrue(machine.is_running, "Machine should still be running")
         machine.abort('Integration test abort')
 
@@ -237,16 +273,9 @@ class TestAbortPreservesPartialResults(_IntegrationBase):
         """
         machine = sm_module.start_test_machine(self.test.pk)
 
-        # Wait long enough for Q1 to likely complete (collection + drain)
-        # but not Q2
-        deadline = time.time() + 60
-        while time.time() < deadline:
-            self.test.refresh_from_db()
-            if self.test.current_q_point == 'Q2':
-                break
-            if self.test.status in ('completed', 'failed', 'aborted'):
-                break
-            time.sleep(0.5)
+        # Wait for Q1 to complete (collection + drain) and Q2 to begin;
+        # the event is also set if the machine finishes early.
+        machine._q_transition_event.wait(timeout=60)
 
         # Abort
         if machine.is_running:
@@ -257,8 +286,12 @@ class TestAbortPreservesPartialResults(_IntegrationBase):
         self.assertIn(self.test.status, ('aborted', 'completed'))
 
         # Both Q-point rows should still exist
-        q1 = TestResult.objects.get(test=self.test, q_point='Q1')
-        q2 = TestResult.objects.get(test=self.test, q_point='Q2')
+        q1, q2 = (
+            TestResult.objects
+            .filter(test=self.test)
+            .only(*_RESULT_FIELDS)
+            .order_by('q_point')
+        )
         self.assertEqual(q1.q_point, 'Q1')
         self.assertEqual(q2.q_point, 'Q2')
 
@@ -283,17 +316,12 @@ class TestManualDUTEntryFlow(_IntegrationBase):
         """
         machine = sm_module.start_test_machine(self.test.pk)
 
-        # Wait for the machine to reach WAIT_MANUAL_DUT or complete
-        deadline = time.time() + 60
-        reached_manual = False
-        while time.time() < deadline:
-            self.test.refresh_from_db()
-            if self.test.current_state == 'WAIT_MANUAL_DUT':
-                reached_manual = True
-                break
-            if self.test.status in ('completed', 'failed', 'aborted'):
-                break
-            time.sleep(0.5)
+        # Wait for the machine to block on a manual DUT reading (the event
+        # is also set if the machine finishes without reaching that point)
+        reached_manual = (
+            machine._manual_dut_entered_event.wait(timeout=60)
+            and machine.is_running
+        )
 
         if reached_manual:
             # Submit manual DUT entries so the test can proceed
@@ -302,7 +330,7 @@ class TestManualDUTEntryFlow(_IntegrationBase):
 
             # Simulate operator entering before/after readings
             # Get current Q-point
-            qp = self.test.current_q_point
+            qp = machine.current_q_point
             record_manual_dut_entry(self.test, qp, 'before', 100.0)
             record_manual_dut_entry(self.test, qp, 'after', 102.0)
 
@@ -316,8 +344,11 @@ class TestManualDUTEntryFlow(_IntegrationBase):
 
 
 @override_settings(HARDWARE_BACKEND='simulator')
-class TestLoRaEncodingRoundtrip(TransactionTestCase):
-    """Integration test: LoRa ASP message encoding roundtrip."""
+class TestLoRaEncodingRoundtrip(SimpleTestCase):
+    """Integration test: LoRa ASP message encoding roundtrip.
+
+    Pure encode/decode with no database access, so no per-test table flush.
+    """
 
     def test_asp_encode_decode_roundtrip(self):
         """ASP protocol can encode and decode a test summary payload."""
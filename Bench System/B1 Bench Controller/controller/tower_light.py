@@ -9,12 +9,16 @@ Maps system states to tower light patterns:
   GREEN blink   — Test passed
   RED+BUZZER    — Test failed
 
-Supports blink patterns via a background timer thread.
+Blink patterns for every controller are driven by one shared scheduler
+thread rather than a thread per pattern.
 """
 
+import heapq
+import itertools
 import logging
 import threading
 import time
+from array import array
 from enum import Enum
 
 logger = logging.getLogger(__name__)
@@ -32,38 +36,201 @@ class LightPattern(Enum):
     DRAINING = 'DRAINING'       # Yellow + green alternating
 
 
-# Pattern definitions: (red, yellow, green, buzzer) tuples
-# For blink patterns, two states alternate
-PATTERN_MAP: dict[LightPattern, list[tuple[bool, bool, bool, bool]]] = {
-    LightPattern.OFF:         [(False, False, False, False)],
-    LightPattern.READY:       [(False, False, True, False)],
-    LightPattern.TESTING:     [(False, True, False, False)],
-    LightPattern.FAULT:       [(True, False, False, False)],
-    LightPattern.ESTOP:       [
-        (True, False, False, False),
-        (False, False, False, False),
-    ],
-    LightPattern.TEST_PASS:   [
-        (False, False, True, False),
-        (False, False, False, False),
-    ],
-    LightPattern.TEST_FAIL:   [
-        (True, False, False, True),
-        (False, False, False, False),
-    ],
-    LightPattern.STABILIZING: [
-        (False, True, False, False),
-        (False, False, False, False),
-    ],
-    LightPattern.DRAINING:    [
-        (False, True, False, False),
-        (False, False, True, False),
-    ],
+# Output bits of a packed tower light state
+RED = 0b1000
+YELLOW = 0b0100
+GREEN = 0b0010
+BUZZER = 0b0001
+ALL_OFF = 0
+
+
+def pack_state(red: bool, yellow: bool, green: bool, buzzer: bool) -> int:
+    """Pack four output flags into one state int."""
+    return (red << 3) | (yellow << 2) | (green << 1) | int(buzzer)
+
+
+# Pattern definitions: packed states (see RED/YELLOW/GREEN/BUZZER).
+# Blink patterns alternate between their states; every pattern has a
+# power-of-two length so the step index can be masked instead of modded.
+PATTERN_MAP: dict[LightPattern, array] = {
+    LightPattern.OFF:         array('B', [ALL_OFF]),
+    LightPattern.READY:       array('B', [GREEN]),
+    LightPattern.TESTING:     array('B', [YELLOW]),
+    LightPattern.FAULT:       array('B', [RED]),
+    LightPattern.ESTOP:       array('B', [RED, ALL_OFF]),
+    LightPattern.TEST_PASS:   array('B', [GREEN, ALL_OFF]),
+    LightPattern.TEST_FAIL:   array('B', [RED | BUZZER, ALL_OFF]),
+    LightPattern.STABILIZING: array('B', [YELLOW, ALL_OFF]),
+    LightPattern.DRAINING:    array('B', [YELLOW, GREEN]),
 }
 
+# Hang each pattern's states on the member itself so set_pattern() reads
+# an attribute instead of hashing the enum into PATTERN_MAP.
+for _pattern, _states in PATTERN_MAP.items():
+    _pattern.states = tuple(_states)
+    _pattern.is_blink = len(_states) > 1
+del _pattern, _states
+
 # Blink rate in seconds
 BLINK_INTERVAL = 0.5
 
+# Longest schedule()/cancel() wait on the blink scheduler, including for a
+# cancelled pattern's write in progress (e.g. a stalled bridge)
+CANCEL_TIMEOUT_S = 1.0
+
+
+class _BlinkScheduler:
+    """
+    Single daemon thread that steps every active blink pattern.
+
+    Entries live in a heap ordered by next deadline. Cancelling marks the
+    entry as a tombstone; it is discarded when it reaches the top of the
+    heap. Callbacks run outside the scheduler lock, so a slow write never
+    blocks schedule() or cancel() of other patterns; cancel() waits only
+    for its own entry's write in progress, so once it returns True a
+    cancelled pattern can no longer overwrite the lights.
+
+    The thread never time.sleep()s: it waits on the condition with the
+    time left to the next deadline, so schedule() and cancel() wake it at
+    once instead of after a blink interval.
+
+    Tests pass a fake ``clock`` with ``autostart=False`` and step it with
+    run_pending(), so toggle counts don't depend on wall-clock timing.
+    """
+
+    # Entry layout: [deadline, seq, callback, states, index, cancelled]
+    _DEADLINE, _SEQ, _CALLBACK, _STATES, _INDEX, _CANCELLED = range(6)
+
+    def __init__(self, clock=time.monotonic, autostart: bool = True):
+        self._clock = clock
+        self._autostart = autostart
+        self._cond = threading.Condition()
+        self._heap: list[list] = []
+        self._seq = itertools.count()
+        self._thread: threading.Thread | None = None
+        self._in_flight: list | None = None  # entry whose callback is running
+
+    def schedule(self, callback, states: tuple[int, ...]) -> list:
+        """
+        Start stepping through packed states; the first one is applied
+        immediately. len(states) must be a power of two.
+
+        If the scheduler stays locked past CANCEL_TIMEOUT_S the pattern is
+        dropped (returned already cancelled) rather than blocking the caller.
+        """
+        entry = [self._clock(), next(self._seq), callback, states, 0, False]
+        if not self._cond.acquire(timeout=CANCEL_TIMEOUT_S):
+            logger.warning(
+                "Tower blink scheduler busy for >%.1fs — blink pattern dropped",
+                CANCEL_TIMEOUT_S,
+            )
+            entry[self._CANCELLED] = True
+            return entry
+        try:
+            heapq.heappush(self._heap, entry)
+            if self._autostart and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name='TowerBlink',
+                    daemon=True,
+                )
+                self._thread.start()
+            self._cond.notify_all()
+        finally:
+            self._cond.release()
+        return entry
+
+    def cancel(self, entry: list) -> bool:
+        """
+        Stop a scheduled blink pattern.
+
+        Returns False if a blink write was still stuck after
+        CANCEL_TIMEOUT_S. The entry is tombstoned either way, so it gets at
+        most that one in-flight write and is never stepped again.
+        """
+        entry[self._CANCELLED] = True
+        deadline = time.monotonic() + CANCEL_TIMEOUT_S
+        if not self._cond.acquire(timeout=CANCEL_TIMEOUT_S):
+            logger.warning(
+                "Tower blink scheduler busy for >%.1fs", CANCEL_TIMEOUT_S,
+            )
+            return False
+        try:
+            self._cond.notify_all()
+            while self._in_flight is entry:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(
+                        "Tower blink write stalled for >%.1fs", CANCEL_TIMEOUT_S,
+                    )
+                    return False
+                self._cond.wait(timeout=remaining)
+        finally:
+            self._cond.release()
+        return True
+
+    def run_pending(self) -> int:
+        """Step every entry due at the current clock time, in this thread.
+
+        For schedulers built with autostart=False; returns the number of
+        writes made.
+        """
+        fired = 0
+        while True:
+            with self._cond:
+                entry = self._pop_due()
+                if entry is None:
+                    return fired
+                self._in_flight = entry
+            self._step(entry)
+            fired += 1
+
+    def _run(self):
+        while True:
+            with self._cond:
+                entry = self._next_due()
+                self._in_flight = entry
+            self._step(entry)
+
+    def _step(self, entry: list):
+        """Apply an in-flight entry's current state and reschedule it."""
+        idx = entry[self._INDEX]
+        states = entry[self._STATES]
+        if not entry[self._CANCELLED]:
+            try:
+                entry[self._CALLBACK](states[idx & (len(states) - 1)])
+            except Exception:
+                logger.exception("Tower blink callback failed")
+        with self._cond:
+            self._in_flight = None
+            self._cond.notify_all()
+            if not entry[self._CANCELLED]:
+                entry[self._INDEX] = idx + 1
+                entry[self._DEADLINE] = self._clock() + BLINK_INTERVAL
+                heapq.heappush(self._heap, entry)
+
+    def _pop_due(self) -> list | None:
+        """Pop the next live entry if it is due. Caller must hold the lock."""
+        while self._heap and self._heap[0][self._CANCELLED]:
+            heapq.heappop(self._heap)
+        if self._heap and self._heap[0][self._DEADLINE] <= self._clock():
+            return heapq.heappop(self._heap)
+        return None
+
+    def _next_due(self) -> list:
+        """Wait for and pop the next live entry. Caller must hold the lock."""
+        while True:
+            entry = self._pop_due()
+            if entry is not None:
+                return entry
+            if not self._heap:
+                self._cond.wait()
+            else:
+                self._cond.wait(timeout=self._heap[0][self._DEADLINE] - self._clock())
+
+
+_blink_scheduler = _BlinkScheduler()
+
 
 class TowerLightController:
     """
@@ -92,9 +259,8 @@ class TowerLightController:
         self._serial_handler = None
 
         self._pattern = LightPattern.OFF
-        self._blink_thread: threading.Thread | None = None
-        self._blink_running = False
-        self._blink_index = 0
+        self._blink_entry: list | None = None
+        self._last_gpio_state: int | None = None
 
     def init_backend(self):
         """Initialise the appropriate backend."""
@@ -108,6 +274,7 @@ class TowerLightController:
     def set_serial_handler(self, handler):
         """Set serial handler for real hardware mode."""
         self._serial_handler = handler
+        self._last_gpio_state = None
 
     # ------------------------------------------------------------------
     #  Pattern control
@@ -120,19 +287,18 @@ class TowerLightController:
                 return
             self._pattern = pattern
 
-        # Stop existing blink thread
+        # Stop existing blink pattern
         self._stop_blink()
 
-        states = PATTERN_MAP.get(pattern, [(False, False, False, False)])
-
-        if len(states) == 1:
-            # Static pattern — apply immediately
-            self._apply_state(*states[0])
+        if pattern.is_blink:
+            # Blink pattern — hand it to the shared scheduler
+            self._start_blink(pattern.states)
         else:
-            # Blink pattern — start blink thread
-            self._start_blink(states)
+            # Static pattern — apply immediately
+            self._apply_state(pattern.states[0])
 
-        logger.debug("Tower light → %s", pattern.value)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Tower light → %s", pattern.value)
 
     @property
     def pattern(self) -> LightPattern:
@@ -141,52 +307,43 @@ class TowerLightController:
             return self._pattern
 
     # ------------------------------------------------------------------
-    #  Blink thread
+    #  Blink scheduling
     # ------------------------------------------------------------------
 
-    def _start_blink(self, states: list[tuple[bool, bool, bool, bool]]):
-        """Start a blink pattern in background."""
-        self._blink_running = True
-        self._blink_index = 0
-        self._blink_thread = threading.Thread(
-            target=self._blink_loop,
-            args=(states,),
-            name='TowerBlink',
-            daemon=True,
-        )
-        self._blink_thread.start()
+    def _start_blink(self, states: tuple[int, ...]):
+        """Start a blink pattern on the shared scheduler."""
+        self._blink_entry = _blink_scheduler.schedule(self._apply_state, states)
 
     def _stop_blink(self):
-        """Stop the blink thread if running."""
-        self._blink_running = False
-        if self._blink_thread:
-            self._blink_thread.join(timeout=1.0)
-            self._blink_thread = None
-
-    def _blink_loop(self, states: list[tuple[bool, bool, bool, bool]]):
-        """Alternates between blink states."""
-        idx = 0
-        while self._blink_running:
-            self._apply_state(*states[idx % len(states)])
-            idx += 1
-            time.sleep(BLINK_INTERVAL)
+        """Cancel the current blink pattern, if any."""
+        if self._blink_entry is not None:
+            _blink_scheduler.cancel(self._blink_entry)
+            self._blink_entry = None
 
     # ------------------------------------------------------------------
     #  Hardware interface
     # ------------------------------------------------------------------
 
-    def _apply_state(self, red: bool, yellow: bool, green: bool, buzzer: bool):
-        """Send tower light state to hardware."""
+    def _apply_state(self, bits: int):
+        """Send a packed tower light state to hardware."""
         if self._backend == 'simulator':
             if self._simulator:
-                self._simulator.set_tower_light(red, yellow, green, buzzer)
+                self._simulator.set_tower_light(
+                    bool(bits & RED), bool(bits & YELLOW),
+                    bool(bits & GREEN), bool(bits & BUZZER),
+                )
         else:
+            # Only the real path is deduplicated: the simulator's lights can
+            # be changed behind our back (E-stop, manual toggles), and a
+            # simulator write costs nothing anyway.
             if self._serial_handler:
+                if bits == self._last_gpio_state:
+                    return  # Outputs already match — skip the bridge round-trip
                 try:
-                    self._serial_handler.gpio_set('TOWER_RED', int(red))
-                    self._serial_handler.gpio_set('TOWER_YELLOW', int(yellow))
-                    self._serial_handler.gpio_set('TOWER_GREEN', int(green))
-                    self._serial_handler.gpio_set('BUZZER', int(buzzer))
+                    self._serial_handler.tower_set(
+                        bits >> 3 & 1, bits >> 2 & 1, bits >> 1 & 1, bits & 1,
+                    )
+                    self._last_gpio_state = bits
                 except Exception:
                     logger.exception("Tower light GPIO write failed")
 
@@ -197,10 +354,12 @@ class TowerLightController:
     def stop(self):
         """Stop the tower light controller and turn off all lights."""
         self._stop_blink()
-        self._apply_state(False, False, False, False)
+        self._last_gpio_state = None  # Always send the final OFF
+        self._apply_state(ALL_OFF)
         self._pattern = LightPattern.OFF
         logger.info("Tower light stopped")
 
     def all_off(self):
         """Turn off all lights without changing pattern state."""
-        self._apply_state(False, False, False, False)
+        self._last_gpio_state = None  # Always send, even if we think they're off
+        self._apply_state(ALL_OFF)
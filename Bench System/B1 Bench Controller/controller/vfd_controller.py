@@ -20,7 +20,7 @@ import logging
 import threading
 import time
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +32,9 @@ REG_ACTUAL_FREQ = 0x2103
 REG_ACTUAL_CURRENT = 0x2104
 REG_FAULT = 0x2105
 
+# Status registers 0x2100..0x2105 are contiguous — read them in one request
+STATUS_BLOCK_LEN = REG_FAULT - REG_STATUS + 1
+
 # Control word values
 CMD_RUN_FORWARD = 0x0001
 CMD_EMERGENCY_STOP = 0x0003
@@ -43,6 +46,41 @@ VFD_FREQ_MAX = 50.0  # Hz
 VFD_ADDR = 1          # Modbus address on Bus 2
 VFD_BUS = 2
 
+# Real-backend status reads within this window reuse the last snapshot
+DEFAULT_MIN_POLL_INTERVAL = 0.1  # seconds
+
+# Simulator status reads step the physics at most this often
+SIM_TICK_S = 0.05
+
+# Encoded MB_WRITE lines for the fixed control words, keyed by (reg, value),
+# and for every 0.1 Hz setpoint from VFD_FREQ_MIN to VFD_FREQ_MAX, indexed by
+# (Hz x 10) - 50. Filled on first use of the real backend so the simulator
+# path never imports the serial stack.
+_PRECOMPUTED_FRAMES: dict[tuple[int, int], bytes] = {}
+_FREQ_FRAMES: list[bytes] = []
+_FREQ_TABLE_MIN = round(VFD_FREQ_MIN * 100)  # setpoint units (Hz x 100)
+
+
+def _encode_write(reg: int, value: int) -> bytes:
+    from comms.serial_handler import encode_command
+    return encode_command({
+        'cmd': 'MB_WRITE',
+        'bus': VFD_BUS,
+        'addr': VFD_ADDR,
+        'reg': reg,
+        'value': value,
+    })
+
+
+def _build_precomputed_frames():
+    """Encode the common VFD write commands once."""
+    for cmd in (CMD_RUN_FORWARD, CMD_EMERGENCY_STOP, CMD_NORMAL_STOP):
+        _PRECOMPUTED_FRAMES[(REG_CONTROL, cmd)] = _encode_write(REG_CONTROL, cmd)
+    _FREQ_FRAMES[:] = [
+        _encode_write(REG_FREQ_SETPOINT, v)
+        for v in range(_FREQ_TABLE_MIN, round(VFD_FREQ_MAX * 100) + 1, 10)
+    ]
+
 
 @dataclass
 class VFDStatus:
@@ -72,12 +110,23 @@ class VFDController:
         vfd.stop()
     """
 
-    def __init__(self, backend: str = 'simulator'):
+    def __init__(self, backend: str = 'simulator', min_poll_interval: float | None = None):
+        """
+        Args:
+            backend: 'simulator' or 'real'.
+            min_poll_interval: read_status() calls closer together than this
+                (seconds) return the last snapshot. Defaults to 0.1 s on the
+                real backend and 0 (always fresh) on the simulator.
+        """
         self._backend = backend
+        if min_poll_interval is None:
+            min_poll_interval = 0.0 if backend == 'simulator' else DEFAULT_MIN_POLL_INTERVAL
+        self._min_poll_interval = min_poll_interval
         self._lock = threading.Lock()
         self._simulator = None
         self._serial = None
         self._status = VFDStatus()
+        self._fault_callbacks: list[Callable[[int, int], None]] = []
 
     def init_backend(self):
         """Initialise the appropriate backend."""
@@ -92,9 +141,28 @@ class VFDController:
             # here we just need the bus2 handler
             logger.info("VFDController using REAL backend")
 
+    def on_fault_change(self, callback: Callable[[int, int], None]):
+        """
+        Register a callback for fault code transitions.
+
+        Called as callback(old_code, new_code) from read_status() whenever
+        the fault register changes, so callers can react to faults without
+        polling status.faulted themselves.
+        """
+        self._fault_callbacks.append(callback)
+
+    def remove_fault_callback(self, callback: Callable[[int, int], None]):
+        """Remove a fault callback."""
+        try:
+            self._fault_callbacks.remove(callback)
+        except ValueError:
+            pass
+
     def set_serial_handler(self, serial_handler):
         """Set the serial handler for real hardware mode."""
         self._serial = serial_handler
+        if serial_handler is not None and not _PRECOMPUTED_FRAMES:
+            _build_precomputed_frames()
         self._status.connected = serial_handler is not None and serial_handler.is_connected
 
     # ------------------------------------------------------------------
@@ -162,11 +230,20 @@ class VFDController:
             else:
                 return self._real_set_frequency(frequency)
 
-    def read_status(self) -> VFDStatus:
-        """Read current VFD status."""
+    def read_status(self, force: bool = False) -> VFDStatus:
+        """
+        Read current VFD status.
+
+        Args:
+            force: Skip the min_poll_interval cache and always read the VFD.
+        """
         with self._lock:
+            if (not force and self._status.connected
+                    and time.time() - self._status.last_read < self._min_poll_interval):
+                return self._status
+            old_fault = self._status.fault_code
             if self._backend == 'simulator':
-                self._simulator.update()
+                self._simulator.update(min_dt=SIM_TICK_S)
                 sim = self._simulator
                 self._status = VFDStatus(
                     running=sim.vfd_running,
@@ -179,12 +256,39 @@ class VFDController:
                 )
             else:
                 self._real_read_status()
-            return self._status
+            status = self._status
+
+        # Outside the lock so callbacks may command the VFD
+        if status.fault_code != old_fault:
+            self._fire_fault_change(old_fault, status.fault_code)
+        return status
+
+    def _fire_fault_change(self, old: int, new: int):
+        if new:
+            logger.warning("VFD fault code %d (was %d)", new, old)
+        else:
+            logger.info("VFD fault %d cleared", old)
+        for cb in self._fault_callbacks:
+            try:
+                cb(old, new)
+            except Exception:
+                logger.exception("VFD fault callback error")
 
     # ------------------------------------------------------------------
     #  Real hardware (Bus 2 serial)
     # ------------------------------------------------------------------
 
+    def _write_register(self, reg: int, value: int) -> dict[str, Any]:
+        """Write one VFD register, reusing a pre-encoded line when available."""
+        if reg == REG_FREQ_SETPOINT:
+            idx, rem = divmod(value - _FREQ_TABLE_MIN, 10)
+            line = _FREQ_FRAMES[idx] if not rem and 0 <= idx < len(_FREQ_FRAMES) else None
+        else:
+            line = _PRECOMPUTED_FRAMES.get((reg, value))
+        if line is not None:
+            return self._serial.send_encoded(line, name='MB_WRITE')
+        return self._serial.modbus_write(VFD_BUS, VFD_ADDR, reg, value)
+
     def _real_start(self, frequency: float) -> bool:
         """Start VFD via real Modbus."""
         if not self._serial or not self._serial.is_connected:
@@ -192,9 +296,9 @@ class VFDController:
             return False
         try:
             # Set frequency first, then run
-            freq_val = int(frequency * 100)
-            r1 = self._serial.modbus_write(VFD_BUS, VFD_ADDR, REG_FREQ_SETPOINT, freq_val)
-            r2 = self._serial.modbus_write(VFD_BUS, VFD_ADDR, REG_CONTROL, CMD_RUN_FORWARD)
+            freq_val = round(frequency * 100)
+            r1 = self._write_register(REG_FREQ_SETPOINT, freq_val)
+            r2 = self._write_register(REG_CONTROL, CMD_RUN_FORWARD)
             ok = r1.get('ok', False) and r2.get('ok', False)
             if ok:
                 self._status.running = True
@@ -209,7 +313,7 @@ class VFDController:
         if not self._serial or not self._serial.is_connected:
             return False
         try:
-            r = self._serial.modbus_write(VFD_BUS, VFD_ADDR, REG_CONTROL, cmd)
+            r = self._write_register(REG_CONTROL, cmd)
             return r.get('ok', False)
         except Exception:
             logger.exception("VFD control write failed")
@@ -220,8 +324,8 @@ class VFDController:
         if not self._serial or not self._serial.is_connected:
             return False
         try:
-            freq_val = int(frequency * 100)
-            r = self._serial.modbus_write(VFD_BUS, VFD_ADDR, REG_FREQ_SETPOINT, freq_val)
+            freq_val = round(frequency * 100)
+            r = self._write_register(REG_FREQ_SETPOINT, freq_val)
             if r.get('ok', False):
                 self._status.target_hz = frequency
                 return True
@@ -231,7 +335,7 @@ class VFDController:
             return False
 
     def _real_read_status(self):
-        """Read all status registers from VFD."""
+        """Read all status registers from VFD in a single Modbus request."""
         if not self._serial or not self._serial.is_connected:
             self._status.connected = False
             return
@@ -240,21 +344,14 @@ class VFDController:
             self._status.connected = True
             self._status.last_read = time.time()
 
-            r = self._serial.modbus_read(VFD_BUS, VFD_ADDR, REG_STATUS, 1)
-            if r.get('ok'):
-                self._status.running = bool(r['data'].get('value', 0) & 0x01)
-
-            r = self._serial.modbus_read(VFD_BUS, VFD_ADDR, REG_ACTUAL_FREQ, 1)
-            if r.get('ok'):
-                self._status.frequency_hz = r['data'].get('value', 0) / 100.0
-
-            r = self._serial.modbus_read(VFD_BUS, VFD_ADDR, REG_ACTUAL_CURRENT, 1)
-            if r.get('ok'):
-                self._status.current_a = r['data'].get('value', 0) / 100.0
-
-            r = self._serial.modbus_read(VFD_BUS, VFD_ADDR, REG_FAULT, 1)
+            r = self._serial.modbus_read(VFD_BUS, VFD_ADDR, REG_STATUS, STATUS_BLOCK_LEN)
             if r.get('ok'):
-                self._status.fault_code = r['data'].get('value', 0)
+                values = r.get('data', {}).get('values', [])
+                if len(values) >= STATUS_BLOCK_LEN:
+                    self._status.running = bool(values[0] & 0x01)
+                    self._status.frequency_hz = values[REG_ACTUAL_FREQ - REG_STATUS] / 100.0
+                    self._status.current_a = values[REG_ACTUAL_CURRENT - REG_STATUS] / 100.0
+                    self._status.fault_code = values[REG_FAULT - REG_STATUS]
 
         except Exception:
             logger.exception("VFD status read failed")
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class LabUiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'lab_ui'
+
+    def ready(self):
+        from lab_ui import signals  # noqa: F401
@@ -0,0 +1,48 @@
+"""Cache keys and invalidation for lab UI data that is cheap to reuse."""
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from meters.models import TestMeter
+from testing.models import ISO4064Standard, Test
+
+# Counters are also bounded by a short TTL, so bulk update()s that skip
+# signals go stale for at most this long.
+DASHBOARD_STATS_TTL = 15  # seconds
+
+
+# ISO 4064 specs only change when the standards table is reseeded
+ISO_DATA_CACHE_KEY = 'lab_iso4064_json_v1'
+ISO_DATA_TTL = 3600  # seconds
+
+# Active-user list for the audit log filter dropdown
+ACTIVE_USERS_CACHE_KEY = 'lab_active_users_v1'
+ACTIVE_USERS_TTL = 300  # seconds
+
+
+def dashboard_stats_key(day) -> str:
+    """Cache key for the dashboard counters; day-scoped so 'today' rolls over."""
+    return f'lab_dashboard_stats_v1:{day.isoformat()}'
+
+
+@receiver(post_save, sender=Test)
+@receiver(post_delete, sender=Test)
+@receiver(post_save, sender=TestMeter)
+@receiver(post_delete, sender=TestMeter)
+def invalidate_dashboard_stats(sender, **kwargs):
+    cache.delete(dashboard_stats_key(timezone.localdate()))
+
+
+@receiver(post_save, sender=ISO4064Standard)
+@receiver(post_delete, sender=ISO4064Standard)
+def invalidate_iso_data(sender, **kwargs):
+    cache.delete(ISO_DATA_CACHE_KEY)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_active_users(sender, **kwargs):
+    cache.delete(ACTIVE_USERS_CACHE_KEY)
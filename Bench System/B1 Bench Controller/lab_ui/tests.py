@@ -1,17 +1,34 @@
+import csv
+import io
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
 from accounts.models import CustomUser
 from meters.models import TestMeter
 from testing.models import Test, TestResult, ISO4064Standard
 
+# Password hashing dominates fixture setup; MD5 is fine for test users.
+_FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
 
-@override_settings(DEPLOYMENT_TYPE='lab')
+
+@override_settings(DEPLOYMENT_TYPE='lab', PASSWORD_HASHERS=_FAST_HASHERS)
 class LabDashboardTest(TestCase):
-    def setUp(self):
-        self.admin = CustomUser.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_user(
             username='labadmin', password='test123', role='admin',
         )
+
+    def setUp(self):
+        cache.clear()
         self.client.login(username='labadmin', password='test123')
 
     def test_dashboard_loads(self):
@@ -27,19 +44,49 @@ class LabDashboardTest(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertContains(resp, 'TST-001')
 
+    def test_dashboard_counts(self):
+        meter = TestMeter.objects.create(
+            serial_number='TST-002', meter_size='DN15', meter_class='B',
+        )
+        Test.objects.create(
+            meter=meter, initiated_by=self.admin, source='lab',
+            status='completed', approval_status='pending', overall_pass=True,
+        )
+        Test.objects.create(meter=meter, initiated_by=self.admin, source='lab')
+        resp = self.client.get(reverse('lab_ui:dashboard'))
+        ctx = resp.context
+        self.assertEqual(ctx['total_tests'], 2)
+        self.assertEqual(ctx['pass_rate'], 50.0)
+        self.assertEqual(ctx['pending_approvals'], 1)
+        self.assertEqual(ctx['today_total'], 2)
+        self.assertEqual(ctx['today_completed'], 1)
+        self.assertEqual(ctx['week_tests'], 2)
+
+    def test_dashboard_stats_invalidated_on_save(self):
+        resp = self.client.get(reverse('lab_ui:dashboard'))
+        self.assertEqual(resp.context['total_tests'], 0)
+        meter = TestMeter.objects.create(
+            serial_number='TST-003', meter_size='DN15', meter_class='B',
+        )
+        Test.objects.create(meter=meter, initiated_by=self.admin, source='lab')
+        resp = self.client.get(reverse('lab_ui:dashboard'))
+        self.assertEqual(resp.context['total_tests'], 1)
+        self.assertEqual(resp.context['total_meters'], 1)
+
     def test_dashboard_requires_login(self):
         self.client.logout()
         resp = self.client.get(reverse('lab_ui:dashboard'))
         self.assertEqual(resp.status_code, 302)
 
 
-@override_settings(DEPLOYMENT_TYPE='lab')
+@override_settings(DEPLOYMENT_TYPE='lab', PASSWORD_HASHERS=_FAST_HASHERS)
 class LabTestWizardTest(TestCase):
-    def setUp(self):
-        self.admin = CustomUser.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_user(
             username='labadmin', password='test123', role='admin',
         )
-        self.meter = TestMeter.objects.create(
+        cls.meter = TestMeter.objects.create(
             serial_number='WIZ-001', meter_size='DN15', meter_class='B',
         )
         ISO4064Standard.objects.create(
@@ -47,6 +94,9 @@ class LabTestWizardTest(TestCase):
             flow_rate_lph=15.6, test_volume_l=5.0, mpe_pct=5.0,
             zone='low', duration_s=120,
         )
+
+    def setUp(self):
+        cache.clear()
         self.client.login(username='labadmin', password='test123')
 
     def test_wizard_get(self):
@@ -54,6 +104,17 @@ class LabTestWizardTest(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertContains(resp, 'WIZ-001')
 
+    def test_wizard_iso_data_cached_and_invalidated(self):
+        url = reverse('lab_ui:test_wizard')
+        self.assertIn('DN15_B', self.client.get(url).context['iso_data_json'])
+        self.assertNotIn('DN20_B', self.client.get(url).context['iso_data_json'])
+        ISO4064Standard.objects.create(
+            meter_size='DN20', meter_class='B', q_point='Q1',
+            flow_rate_lph=25.0, test_volume_l=5.0, mpe_pct=5.0,
+            zone='low', duration_s=120,
+        )
+        self.assertIn('DN20_B', self.client.get(url).context['iso_data_json'])
+
     def test_wizard_post_creates_test(self):
         resp = self.client.post(reverse('lab_ui:test_wizard'), {
             'meter_id': self.meter.pk,
@@ -76,15 +137,18 @@ class LabTestWizardTest(TestCase):
         self.assertEqual(resp.status_code, 403)
 
 
-@override_settings(DEPLOYMENT_TYPE='lab')
+@override_settings(DEPLOYMENT_TYPE='lab', PASSWORD_HASHERS=_FAST_HASHERS)
 class LabLiveMonitorTest(TestCase):
-    def setUp(self):
-        self.admin = CustomUser.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_user(
             username='labadmin', password='test123', role='admin',
         )
-        self.meter = TestMeter.objects.create(
+        cls.meter = TestMeter.objects.create(
             serial_number='MON-001', meter_size='DN15', meter_class='B',
         )
+
+    def setUp(self):
         self.client.login(username='labadmin', password='test123')
 
     def test_monitor_no_active_test(self):
@@ -117,13 +181,81 @@ class LabLiveMonitorTest(TestCase):
         self.assertEqual(data['test_id'], test.pk)
         self.assertEqual(data['status'], 'running')
 
+    def _stream_frames(self, test):
+        async def read():
+            resp = await self.async_client.get(
+                reverse('lab_ui:monitor_stream', args=[test.pk]),
+            )
+            return resp, b''.join([chunk async for chunk in resp.streaming_content])
+
+        self.async_client.force_login(self.admin)
+        resp, body = async_to_sync(read)()
+        self.assertEqual(resp['Content-Type'], 'text/event-stream')
+        # Async, so ASGI sends each frame instead of buffering the whole stream
+        self.assertTrue(resp.is_async)
+        return [f for f in body.decode().split('\n\n') if f]
+
+    def test_monitor_stream_ends_on_terminal_status(self):
+        test = Test.objects.create(
+            meter=self.meter, initiated_by=self.admin, status='completed',
+        )
+        frames = self._stream_frames(test)
+        self.assertEqual(frames[0], 'retry: 2000')
+        self.assertEqual(len(frames), 2)
+        data = json.loads(frames[1].removeprefix('data: '))
+        self.assertEqual(data['test_id'], test.pk)
+        self.assertEqual(data['status'], 'completed')
 
-@override_settings(DEPLOYMENT_TYPE='lab')
+    def test_monitor_stream_bounded_lifetime(self):
+        test = Test.objects.create(
+            meter=self.meter, initiated_by=self.admin, status='running',
+        )
+        with mock.patch('lab_ui.views.MONITOR_STREAM_MAX_S', 0):
+            frames = self._stream_frames(test)
+        self.assertEqual(len(frames), 2)
+        self.assertEqual(json.loads(frames[1][6:])['status'], 'running')
+
+    def test_monitor_stream_unknown_test(self):
+        resp = self.client.get(reverse('lab_ui:monitor_stream', args=[99999]))
+        self.assertEqual(resp.status_code, 404)
+
+    def test_monitor_data_api_sensors_from_recorder_cache(self):
+        from types import SimpleNamespace
+        from testing.services import record_sensor_reading
+        cache.clear()
+        test = Test.objects.create(
+            meter=self.meter, initiated_by=self.admin, status='running',
+        )
+        snapshot = SimpleNamespace(
+            flow_rate_lph=1500.0, em_totalizer_l=0.0, weight_kg=12.5,
+            pressure_upstream_bar=2.1, pressure_downstream_bar=1.9,
+            water_temp_c=24.0, vfd_freq_hz=30.0, vfd_current_a=3.2,
+            dut_totalizer_l=None,
+        )
+        record_sensor_reading(test, snapshot)
+        url = reverse('lab_ui:monitor_data', args=[test.pk])
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(url).json()
+        self.assertEqual(data['sensors']['flow_rate_lph'], 1500.0)
+        self.assertEqual(data['sensors']['pressure_bar'], 2.1)
+        self.assertFalse(any(
+            'bench_ui_sensorreading' in q['sql'] for q in ctx.captured_queries
+        ))
+        cache.clear()
+        data = self.client.get(url).json()
+        self.assertEqual(data['sensors']['weight_kg'], 12.5)
+
+
+@override_settings(DEPLOYMENT_TYPE='lab', PASSWORD_HASHERS=_FAST_HASHERS)
 class LabCertificatesTest(TestCase):
-    def setUp(self):
-        self.admin = CustomUser.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_user(
             username='labadmin', password='test123', role='admin',
         )
+
+    def setUp(self):
         self.client.login(username='labadmin', password='test123')
 
     def test_certificates_page_loads(self):
@@ -131,13 +263,60 @@ class LabCertificatesTest(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertContains(resp, 'Certificates')
 
+    def test_certificates_listing_no_per_row_queries(self):
+        meter = TestMeter.objects.create(
+            serial_number='CRT-001', meter_size='DN15', meter_class='B',
+        )
 
-@override_settings(DEPLOYMENT_TYPE='lab')
+        def issue(n):
+            Test.objects.create(
+                meter=meter, initiated_by=self.admin, approved_by=self.admin,
+                certificate_number=f'CERT-{n}', certificate_pdf=f'c{n}.pdf',
+                overall_pass=True,
+            )
+
+        issue(0)
+        url = reverse('lab_ui:certificates')
+        self.client.get(url)
+        baseline = self._queries(url)
+        for n in range(1, 4):
+            issue(n)
+        with self.assertNumQueries(baseline):
+            resp = self.client.get(url)
+        self.assertContains(resp, 'CERT-3')
+        self.assertContains(resp, 'CRT-001')
+
+    def test_certificates_paginated(self):
+        meter = TestMeter.objects.create(
+            serial_number='CRT-002', meter_size='DN15', meter_class='B',
+        )
+        Test.objects.bulk_create([
+            Test(meter=meter, initiated_by=self.admin, certificate_number=f'PG-{n:03d}')
+            for n in range(55)
+        ])
+        resp = self.client.get(reverse('lab_ui:certificates'))
+        page = resp.context['page_obj']
+        self.assertEqual(len(page.object_list), 50)
+        self.assertEqual(page.paginator.num_pages, 2)
+        resp = self.client.get(reverse('lab_ui:certificates'), {'page': 2})
+        self.assertEqual(len(resp.context['page_obj'].object_list), 5)
+
+    def _queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        return len(ctx.captured_queries)
+
+
+@override_settings(DEPLOYMENT_TYPE='lab', PASSWORD_HASHERS=_FAST_HASHERS)
 class LabAuditLogTest(TestCase):
-    def setUp(self):
-        self.admin = CustomUser.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_user(
             username='labadmin', password='test123', role='admin',
         )
+
+    def setUp(self):
+        cache.clear()
         self.client.login(username='labadmin', password='test123')
 
     def test_audit_log_loads(self):
@@ -153,18 +332,113 @@ class LabAuditLogTest(TestCase):
         resp = self.client.get(reverse('lab_ui:audit_log'))
         self.assertEqual(resp.status_code, 403)
 
+    def test_audit_log_query_count_stable(self):
+        from audit.models import AuditEntry
+        AuditEntry.objects.create(user=self.admin, action='login')
+        url = reverse('lab_ui:audit_log')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+        AuditEntry.objects.bulk_create([
+            AuditEntry(user=self.admin, action='update', description=f'e{i}')
+            for i in range(10)
+        ])
+        with CaptureQueriesContext(connection) as many:
+            resp = self.client.get(url)
+        self.assertEqual(len(many.captured_queries), len(few.captured_queries))
+        self.assertContains(resp, 'e9')
+        entries_sql = [q['sql'] for q in many.captured_queries if 'audit_auditentry' in q['sql']]
+        self.assertFalse(any('metadata' in sql for sql in entries_sql))
+
+    def test_audit_log_date_range_uses_local_days(self):
+        from datetime import datetime
+        from audit.models import AuditEntry
+        tz = timezone.get_current_timezone()
+        stamps = {
+            'before': datetime(2026, 3, 9, 23, 59, tzinfo=tz),
+            'first': datetime(2026, 3, 10, 0, 0, tzinfo=tz),
+            'last': datetime(2026, 3, 11, 23, 59, 59, tzinfo=tz),
+            'after': datetime(2026, 3, 12, 0, 0, tzinfo=tz),
+        }
+        for desc, ts in stamps.items():
+            entry = AuditEntry.objects.create(user=self.admin, action='update', description=desc)
+            AuditEntry.objects.filter(pk=entry.pk).update(timestamp=ts)
+        resp = self.client.get(reverse('lab_ui:audit_log'), {
+            'date_from': '2026-03-10', 'date_to': '2026-03-11',
+        })
+        shown = {e.description for e in resp.context['page_obj']}
+        self.assertEqual(shown, {'first', 'last'})
+
+    def test_audit_log_ignores_malformed_dates(self):
+        resp = self.client.get(reverse('lab_ui:audit_log'), {'date_from': 'yesterday'})
+        self.assertEqual(resp.status_code, 200)
+
+    def test_audit_log_count_cached_per_filter(self):
+        from audit.models import AuditEntry
+        AuditEntry.objects.create(user=self.admin, action='login')
+        url = reverse('lab_ui:audit_log')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url)
+        self.assertFalse(any('COUNT(' in q['sql'] for q in ctx.captured_queries))
+        self.assertEqual(resp.context['page_obj'].paginator.count, 1)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, {'action': 'logout'})
+        self.assertTrue(any('COUNT(' in q['sql'] for q in ctx.captured_queries))
+        self.assertEqual(resp.context['page_obj'].paginator.count, 0)
+
+    def test_audit_log_user_filter_cached(self):
+        self.admin.first_name, self.admin.last_name = 'Lab', 'Admin'
+        self.admin.save()
+        resp = self.client.get(reverse('lab_ui:audit_log'))
+        self.assertContains(resp, 'Lab Admin</option>')
+        CustomUser.objects.create_user(username='newtech', password='x', role='lab_tech')
+        resp = self.client.get(reverse('lab_ui:audit_log'))
+        self.assertContains(resp, 'newtech</option>')
+
     def test_audit_export(self):
         resp = self.client.get(reverse('lab_ui:audit_export'))
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(resp['Content-Type'], 'text/csv')
 
+    def test_audit_export_rows(self):
+        from audit.models import AuditEntry
+        AuditEntry.objects.create(
+            user=self.admin, action='create', target_type='test', target_id=7,
+            description='Created "x", y',
+        )
+        AuditEntry.objects.create(user=None, action='login')
+        resp = self.client.get(reverse('lab_ui:audit_export'))
+        rows = list(csv.reader(
+            b''.join(resp.streaming_content).decode().splitlines(),
+        ))
+        self.assertEqual(len(rows), 3)
+        by_action = {r[2]: r for r in rows[1:]}
+        self.assertEqual(by_action['create'][1:], ['labadmin', 'create', 'test', '7', 'Created "x", y'])
+        self.assertEqual(by_action['login'][1], 'system')
+        self.assertEqual(by_action['login'][4], '')
+
+    def test_audit_export_multiline_description(self):
+        from audit.models import AuditEntry
+        AuditEntry.objects.create(
+            user=self.admin, action='update', description='line one\nline "two", end',
+        )
+        resp = self.client.get(reverse('lab_ui:audit_export'))
+        content = b''.join(resp.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][5], 'line one\nline "two", end')
+
 
-@override_settings(DEPLOYMENT_TYPE='lab')
+@override_settings(DEPLOYMENT_TYPE='lab', PASSWORD_HASHERS=_FAST_HASHERS)
 class LabSettingsTest(TestCase):
-    def setUp(self):
-        self.admin = CustomUser.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_user(
             username='labadmin', password='test123', role='admin',
         )
+
+    def setUp(self):
         self.client.login(username='labadmin', password='test123')
 
     def test_settings_loads(self):
@@ -181,14 +455,17 @@ class LabSettingsTest(TestCase):
         self.assertEqual(resp.status_code, 403)
 
 
-@override_settings(DEPLOYMENT_TYPE='lab')
+@override_settings(DEPLOYMENT_TYPE='lab', PASSWORD_HASHERS=_FAST_HASHERS)
 class LabLoRaStatusAPITest(TestCase):
     """Tests for the lora_status_api endpoint (US-306)."""
 
-    def setUp(self):
-        self.admin = CustomUser.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_user(
             username='labadmin', password='test123', role='admin',
         )
+
+    def setUp(self):
         self.client.login(username='labadmin', password='test123')
 
     def test_lora_status_returns_json(self):
@@ -203,14 +480,17 @@ class LabLoRaStatusAPITest(TestCase):
         self.assertEqual(resp.status_code, 302)
 
 
-@override_settings(DEPLOYMENT_TYPE='lab')
+@override_settings(DEPLOYMENT_TYPE='lab', PASSWORD_HASHERS=_FAST_HASHERS)
 class LabLoRaHistoryAPITest(TestCase):
     """Tests for the lora_history_api endpoint."""
 
-    def setUp(self):
-        self.admin = CustomUser.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_user(
             username='labadmin', password='test123', role='admin',
         )
+
+    def setUp(self):
         self.client.login(username='labadmin', password='test123')
 
     def test_lora_history_returns_json(self):
@@ -226,15 +506,18 @@ class LabLoRaHistoryAPITest(TestCase):
         self.assertEqual(resp.status_code, 302)
 
 
-@override_settings(DEPLOYMENT_TYPE='lab')
+@override_settings(DEPLOYMENT_TYPE='lab', PASSWORD_HASHERS=_FAST_HASHERS)
 class LabCSVExportTest(TestCase):
-    def setUp(self):
-        self.admin = CustomUser.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_user(
             username='labadmin', password='test123', role='admin',
         )
-        self.meter = TestMeter.objects.create(
+        cls.meter = TestMeter.objects.create(
             serial_number='EXP-001', meter_size='DN15', meter_class='B',
         )
+
+    def setUp(self):
         self.client.login(username='labadmin', password='test123')
 
     def test_test_export_csv(self):
@@ -246,3 +529,29 @@ class LabCSVExportTest(TestCase):
         self.assertEqual(resp['Content-Type'], 'text/csv')
         content = b''.join(resp.streaming_content).decode()
         self.assertIn('EXP-001', content)
+
+    def test_test_export_csv_quotes_fields(self):
+        meter = TestMeter.objects.create(
+            serial_number='EXP,002', meter_size='DN15', meter_class='B',
+        )
+        Test.objects.create(meter=meter, initiated_by=self.admin, source='lab')
+        resp = self.client.get(reverse('lab_ui:test_export_csv'))
+        rows = list(csv.reader(
+            b''.join(resp.streaming_content).decode().splitlines(),
+        ))
+        self.assertEqual(rows[0][0], 'Test #')
+        self.assertEqual(rows[1][1], 'EXP,002')
+        self.assertEqual(len(rows[1]), len(rows[0]))
+
+    def test_test_export_csv_display_labels(self):
+        Test.objects.create(
+            meter=self.meter, initiated_by=self.admin, source='lab',
+            status='completed', approval_status='approved', overall_pass=False,
+        )
+        resp = self.client.get(reverse('lab_ui:test_export_csv'))
+        rows = list(csv.reader(io.StringIO(b''.join(resp.streaming_content).decode())))
+        _, serial, size, _, status, result, source, user, _, _, approval, _ = rows[1]
+        self.assertEqual(
+            (serial, size, status, result, source, user, approval),
+            ('EXP-001', 'DN15', 'Completed', 'FAIL', 'Lab', 'labadmin', 'Approved'),
+        )
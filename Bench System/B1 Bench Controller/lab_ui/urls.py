@@ -10,6 +10,7 @@ urlpatterns = [
     path('api/lora-history/', views.lora_history_api, name='lora_history_api'),
     path('monitor/<int:test_id>/', views.live_monitor, name='live_monitor'),
     path('monitor/data/<int:test_id>/', views.monitor_data_api, name='monitor_data'),
+    path('monitor/stream/<int:test_id>/', views.monitor_stream, name='monitor_stream'),
     path('test/new/', views.test_wizard, name='test_wizard'),
     path('certificates/', views.certificates, name='certificates'),
     path('settings/', views.lab_settings, name='settings'),
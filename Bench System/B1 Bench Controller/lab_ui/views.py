@@ -1,39 +1,107 @@
+import asyncio
 import csv
+import hashlib
 import json
+from datetime import date, datetime, time, timedelta
+from time import monotonic
 
+from asgiref.sync import sync_to_async
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, Q
 from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.views.decorators.http import require_POST
 
+from accounts.models import CustomUser
 from accounts.permissions import role_required
+from lab_ui.signals import (
+    ACTIVE_USERS_CACHE_KEY, ACTIVE_USERS_TTL,
+    DASHBOARD_STATS_TTL, ISO_DATA_CACHE_KEY, ISO_DATA_TTL, dashboard_stats_key,
+)
 from meters.models import TestMeter
-from testing.models import Test, TestResult, ISO4064Standard
+from testing.models import TEST_CLASS_CHOICES, Test, TestResult, ISO4064Standard
+from testing.services import sensor_cache_key, sensor_payload
+
+try:
+    from comms.lora_handler import get_lora_handler
+except ImportError:  # serial/crypto stack not installed
+    # The LoRa calls below are best-effort; their except blocks absorb this
+    get_lora_handler = None
+
+try:
+    from audit.models import AuditEntry
+    from audit.utils import log_audit
+except ImportError:
+    AuditEntry = log_audit = None
+
+
+class _Echo:
+    """File-like sink whose write() hands the row back, for streaming csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_response(filename: str, header: list[str], rows) -> StreamingHttpResponse:
+    """Stream header + rows as a CSV attachment, one csv.writer row per chunk."""
+    writer = csv.writer(_Echo(), lineterminator='\n')
+
+    def generate():
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(generate(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
 
 
 # ---------------------------------------------------------------------------
 #  T-502: Dashboard
 # ---------------------------------------------------------------------------
 
+def _dashboard_stats(today):
+    """Test and meter counters for the dashboard (test counts in one query)."""
+    week_start = today - timedelta(days=today.weekday())
+    stats = Test.objects.aggregate(
+        total=Count('id'),
+        passed=Count('id', filter=Q(overall_pass=True)),
+        pending_approvals=Count(
+            'id', filter=Q(status='completed', approval_status='pending'),
+        ),
+        today_total=Count('id', filter=Q(created_at__date=today)),
+        today_completed=Count(
+            'id', filter=Q(created_at__date=today, status='completed'),
+        ),
+        week_tests=Count('id', filter=Q(created_at__date__gte=week_start)),
+    )
+    stats['total_meters'] = TestMeter.objects.count()
+    return stats
+
+
 @login_required
 def dashboard(request):
     """Lab dashboard: stats, active test, comms status, recent tests."""
-    today = timezone.now().date()
+    today = timezone.localdate()
 
     active_test = Test.objects.filter(
         status__in=['running', 'queued', 'acknowledged'],
     ).select_related('meter').first()
 
-    today_tests = Test.objects.filter(created_at__date=today)
-    pending_approvals = Test.objects.filter(
-        status='completed', approval_status='pending',
-    ).count()
-
-    total_tests = Test.objects.count()
-    total_meters = TestMeter.objects.count()
-    passed = Test.objects.filter(overall_pass=True).count()
-    pass_rate = round(passed / total_tests * 100, 1) if total_tests else 0
+    stats = cache.get_or_set(
+        dashboard_stats_key(today),
+        lambda: _dashboard_stats(today),
+        timeout=DASHBOARD_STATS_TTL,
+    )
+    total_tests = stats['total']
+    pass_rate = round(stats['passed'] / total_tests * 100, 1) if total_tests else 0
 
     recent_tests = Test.objects.select_related(
         'meter', 'initiated_by',
@@ -42,27 +110,20 @@ def dashboard(request):
     # LoRa link status (best-effort)
     lora_status = {'state': 'unknown'}
     try:
-        from comms.lora_handler import get_lora_handler
-        handler = get_lora_handler()
-        lora_status = handler.get_status()
+        lora_status = get_lora_handler().get_status()
     except Exception:
         pass
     link_status = lora_status.get('state', 'unknown')
 
-    # Week test count
-    from datetime import timedelta
-    week_start = today - timedelta(days=today.weekday())
-    week_tests = Test.objects.filter(created_at__date__gte=week_start).count()
-
     return render(request, 'lab_ui/dashboard.html', {
         'active_test': active_test,
-        'today_completed': today_tests.filter(status='completed').count(),
-        'today_total': today_tests.count(),
-        'pending_approvals': pending_approvals,
+        'today_completed': stats['today_completed'],
+        'today_total': stats['today_total'],
+        'pending_approvals': stats['pending_approvals'],
         'total_tests': total_tests,
-        'total_meters': total_meters,
+        'total_meters': stats['total_meters'],
         'pass_rate': pass_rate,
-        'week_tests': week_tests,
+        'week_tests': stats['week_tests'],
         'recent_tests': recent_tests,
         'link_status': link_status,
         'lora_status': lora_status,
@@ -77,9 +138,7 @@ def dashboard(request):
 def lora_status_api(request):
     """JSON endpoint for LoRa connection health (polled by dashboard)."""
     try:
-        from comms.lora_handler import get_lora_handler
-        handler = get_lora_handler()
-        return JsonResponse(handler.get_status())
+        return JsonResponse(get_lora_handler().get_status())
     except Exception:
         return JsonResponse({'state': 'unknown'})
 
@@ -88,7 +147,6 @@ def lora_status_api(request):
 def lora_history_api(request):
     """JSON endpoint for LoRa message history."""
     try:
-        from comms.lora_handler import get_lora_handler
         handler = get_lora_handler()
         limit = int(request.GET.get('limit', 50))
         include_hb = request.GET.get('heartbeats', '0') == '1'
@@ -104,6 +162,23 @@ def lora_history_api(request):
 #  T-503: Test Wizard (3-step)
 # ---------------------------------------------------------------------------
 
+def _build_iso_json() -> str:
+    """ISO 4064 specs grouped by size/class, as JSON for the wizard's step 2 preview."""
+    iso_data = {}
+    for std in ISO4064Standard.objects.all().order_by('q_point'):
+        key = f"{std.meter_size}_{std.meter_class}"
+        if key not in iso_data:
+            iso_data[key] = []
+        iso_data[key].append({
+            'q_point': std.q_point,
+            'flow_rate_lph': std.flow_rate_lph,
+            'test_volume_l': std.test_volume_l,
+            'mpe_pct': std.mpe_pct,
+            'zone': std.zone,
+        })
+    return json.dumps(iso_data)
+
+
 @role_required('admin', 'manager', 'lab_tech')
 def test_wizard(request):
     """3-step test creation wizard for lab."""
@@ -113,74 +188,56 @@ def test_wizard(request):
         test_class = request.POST.get('test_class', meter.meter_class)
         notes = request.POST.get('notes', '').strip()
 
-        test = Test.objects.create(
-            meter=meter,
-            test_class=test_class,
-            initiated_by=request.user,
-            source='lab',
-            notes=notes,
-        )
+        with transaction.atomic():
+            test = Test.objects.create(
+                meter=meter,
+                test_class=test_class,
+                initiated_by=request.user,
+                source='lab',
+                notes=notes,
+            )
 
-        # Auto-populate Q-point result placeholders
-        q_points = ISO4064Standard.objects.filter(
-            meter_size=meter.meter_size,
-            meter_class=test_class,
-        )
-        for qp in q_points:
-            TestResult.objects.create(
-                test=test,
-                q_point=qp.q_point,
-                target_flow_lph=qp.flow_rate_lph,
-                mpe_pct=qp.mpe_pct,
-                zone=qp.zone,
+            # Auto-populate Q-point result placeholders in one INSERT
+            q_points = ISO4064Standard.objects.filter(
+                meter_size=meter.meter_size,
+                meter_class=test_class,
             )
+            TestResult.objects.bulk_create([
+                TestResult(
+                    test=test,
+                    q_point=qp.q_point,
+                    target_flow_lph=qp.flow_rate_lph,
+                    mpe_pct=qp.mpe_pct,
+                    zone=qp.zone,
+                )
+                for qp in q_points
+            ])
 
         # Try sending START_TEST via LoRa (non-fatal)
         try:
-            from comms.lora_handler import get_lora_handler
             handler = get_lora_handler()
             if handler.link_online:
                 handler.send_start_test_ack(test.pk, status='submitted')
         except Exception:
             pass
 
-        # Audit log
-        try:
-            from audit.utils import log_audit
+        # Audit log (log_audit swallows its own DB errors)
+        if log_audit is not None:
             log_audit(
                 request.user, 'create', 'test', test.pk,
                 f'Created test #{test.pk} for {meter.serial_number} via lab wizard',
                 ip_address=request.META.get('REMOTE_ADDR'),
             )
-        except Exception:
-            pass
 
-        from django.contrib import messages
         messages.success(request, f"Test #{test.pk} submitted for {meter.serial_number}.")
         return redirect('testing:test_detail', pk=test.pk)
 
     meters = TestMeter.objects.all().order_by('serial_number')
 
-    # Build ISO data as JSON for JavaScript step 2 preview
-    iso_data = {}
-    for std in ISO4064Standard.objects.all().order_by('q_point'):
-        key = f"{std.meter_size}_{std.meter_class}"
-        if key not in iso_data:
-            iso_data[key] = []
-        iso_data[key].append({
-            'q_point': std.q_point,
-            'flow_rate_lph': std.flow_rate_lph,
-            'test_volume_l': std.test_volume_l,
-            'mpe_pct': std.mpe_pct,
-            'zone': std.zone,
-        })
-
-    from testing.models import TEST_CLASS_CHOICES
-
     return render(request, 'lab_ui/test_wizard.html', {
         'meters': meters,
         'class_choices': TEST_CLASS_CHOICES,
-        'iso_data_json': json.dumps(iso_data),
+        'iso_data_json': cache.get_or_set(ISO_DATA_CACHE_KEY, _build_iso_json, ISO_DATA_TTL),
     })
 
 
@@ -193,11 +250,12 @@ def live_monitor(request, test_id):
     """Lab live monitor page with HTMX polling."""
     if test_id == 0:
         # Find active test or show empty
-        active = Test.objects.filter(
+        # Served by the test_active_idx partial index; only the pk is needed
+        active_pk = Test.objects.filter(
             status__in=['running', 'queued', 'acknowledged'],
-        ).select_related('meter').first()
-        if active:
-            return redirect('lab_ui:live_monitor', test_id=active.pk)
+        ).values_list('pk', flat=True).first()
+        if active_pk:
+            return redirect('lab_ui:live_monitor', test_id=active_pk)
         return render(request, 'lab_ui/live_monitor.html', {
             'test': None,
             'results': [],
@@ -211,10 +269,8 @@ def live_monitor(request, test_id):
     })
 
 
-@login_required
-def monitor_data_api(request, test_id):
-    """JSON endpoint for HTMX live monitor polling."""
-    test = get_object_or_404(Test, pk=test_id)
+def _monitor_payload(test) -> dict:
+    """Live monitor state for a test: status, Q-point results and latest sensors."""
     results = list(test.results.values(
         'q_point', 'target_flow_lph', 'error_pct', 'mpe_pct',
         'passed', 'zone', 'ref_volume_l', 'dut_volume_l',
@@ -229,22 +285,82 @@ def monitor_data_api(request, test_id):
         'results': results,
     }
 
-    # Try to get live sensor data from bench_ui SensorReading
-    try:
-        from bench_ui.models import SensorReading
-        latest = SensorReading.objects.filter(test=test).order_by('-timestamp').first()
-        if latest:
-            data['sensors'] = {
-                'flow_rate_lph': latest.flow_rate_lph,
-                'pressure_bar': latest.pressure_upstream_bar,
-                'weight_kg': latest.weight_kg,
-                'temperature_c': latest.water_temp_c,
-                'vfd_freq_hz': latest.vfd_freq_hz,
-            }
-    except Exception:
-        pass
+    # Live sensor data: the recorder caches each new reading; fall back to
+    # the latest bench_ui SensorReading when the cache is cold
+    sensors = cache.get(sensor_cache_key(test.pk))
+    if sensors is None:
+        try:
+            from bench_ui.models import SensorReading
+            latest = SensorReading.objects.filter(test=test).order_by('-timestamp').first()
+            if latest:
+                sensors = sensor_payload(latest)
+        except Exception:
+            pass
+    if sensors is not None:
+        data['sensors'] = sensors
+    return data
+
+
+_MONITOR_TEST_FIELDS = ('pk', 'status', 'current_q_point', 'current_state', 'overall_pass')
+_TERMINAL_STATUSES = ('completed', 'failed', 'aborted')
+
+# Server-sent events for the live monitor. The stream checks as often as the
+# HTMX poller it replaces, so the DB cost per open page is unchanged; what
+# goes away is the per-poll request/auth cycle and the unchanged responses.
+MONITOR_STREAM_TICK_S = 2.0
+MONITOR_STREAM_KEEPALIVE_S = 15.0
+MONITOR_STREAM_MAX_S = 300.0  # then EventSource reconnects; bounds a held worker
+
 
-    return JsonResponse(data)
+@login_required
+def monitor_data_api(request, test_id):
+    """JSON endpoint for HTMX live monitor polling (SSE fallback)."""
+    test = get_object_or_404(Test.objects.only(*_MONITOR_TEST_FIELDS), pk=test_id)
+    return JsonResponse(_monitor_payload(test))
+
+
+def _monitor_frame(test_id):
+    """(status, JSON payload) for a test, or None once it is gone."""
+    test = Test.objects.only(*_MONITOR_TEST_FIELDS).filter(pk=test_id).first()
+    if test is None:
+        return None
+    return test.status, json.dumps(_monitor_payload(test), cls=DjangoJSONEncoder)
+
+
+async def _monitor_events(test_id):
+    """Yield SSE frames for a test, sending a payload only when it changes.
+
+    Async so ASGI (daphne) sends each frame as it is produced; Django reads
+    a sync iterator to the end before sending anything.
+    """
+    yield 'retry: 2000\n\n'
+    last = None
+    started = last_sent = monotonic()
+    while True:
+        current = await sync_to_async(_monitor_frame)(test_id)
+        if current is None:
+            return
+        status, frame = current
+        now = monotonic()
+        if frame != last:
+            last, last_sent = frame, now
+            yield f'data: {frame}\n\n'
+        elif now - last_sent >= MONITOR_STREAM_KEEPALIVE_S:
+            last_sent = now
+            yield ': keepalive\n\n'
+        if status in _TERMINAL_STATUSES or now - started >= MONITOR_STREAM_MAX_S:
+            return
+        await asyncio.sleep(MONITOR_STREAM_TICK_S)
+
+
+@login_required
+def monitor_stream(request, test_id):
+    """Server-sent event stream of live monitor updates."""
+    get_object_or_404(Test.objects.only('pk'), pk=test_id)
+    response = StreamingHttpResponse(_monitor_events(test_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 # ---------------------------------------------------------------------------
@@ -256,18 +372,25 @@ def certificates(request):
     """Certificates listing page."""
     certs = Test.objects.filter(
         certificate_number__gt='',
-    ).select_related('meter', 'initiated_by', 'approved_by').order_by('-completed_at')
+    ).select_related('meter', 'initiated_by', 'approved_by').only(
+        # Just what the listing renders — the joined rows are otherwise wide
+        'pk', 'certificate_number', 'certificate_pdf', 'completed_at', 'overall_pass',
+        'meter__serial_number', 'meter__meter_size',
+        'initiated_by__username', 'initiated_by__first_name', 'initiated_by__last_name',
+        'approved_by__username', 'approved_by__first_name', 'approved_by__last_name',
+    ).order_by('-completed_at')
 
     search_q = request.GET.get('q', '').strip()
     if search_q:
-        from django.db.models import Q
         certs = certs.filter(
             Q(certificate_number__icontains=search_q) |
             Q(meter__serial_number__icontains=search_q)
         )
 
+    page_obj = Paginator(certs, 50).get_page(request.GET.get('page'))
+
     return render(request, 'lab_ui/certificates.html', {
-        'certs': certs,
+        'page_obj': page_obj,
         'search_q': search_q,
     })
 
@@ -276,15 +399,49 @@ def certificates(request):
 #  T-510: Audit Log
 # ---------------------------------------------------------------------------
 
+class _CachedCountPaginator(Paginator):
+    """Paginator whose COUNT(*) is cached briefly per distinct filtered query."""
+
+    COUNT_TTL = 60  # seconds
+
+    @cached_property
+    def count(self):
+        sql = str(self.object_list.query)
+        key = 'auditcount:' + hashlib.md5(sql.encode()).hexdigest()
+        return cache.get_or_set(key, self.object_list.count, self.COUNT_TTL)
+
+
+def _local_day_start(value: str, offset_days: int = 0):
+    """Aware local midnight for an ISO date string (+offset days), or None if invalid."""
+    try:
+        day = date.fromisoformat(value)
+    except ValueError:
+        return None
+    return timezone.make_aware(datetime.combine(day + timedelta(days=offset_days), time.min))
+
+
+def _active_users() -> list[dict]:
+    """Active users as {'pk', 'name'} for the audit log user filter."""
+    return [
+        {'pk': pk, 'name': f'{first} {last}'.strip() or username}
+        for pk, username, first, last in CustomUser.objects.filter(
+            is_active=True,
+        ).order_by('username').values_list('pk', 'username', 'first_name', 'last_name')
+    ]
+
+
 @role_required('admin', 'manager')
 def audit_log(request):
     """Audit log page with filters."""
-    try:
-        from audit.models import AuditEntry
-    except ImportError:
+    if AuditEntry is None:
         return render(request, 'lab_ui/audit_log.html', {'entries': [], 'page_obj': None})
 
-    entries = AuditEntry.objects.select_related('user').order_by('-timestamp')
+    # Only the columns the table renders; skips metadata JSON and the
+    # user's password/role/etc.
+    entries = AuditEntry.objects.select_related('user').only(
+        'timestamp', 'action', 'target_type', 'target_id', 'description',
+        'ip_address', 'user__username', 'user__first_name', 'user__last_name',
+    ).order_by('-timestamp')
 
     # Filters
     action_filter = request.GET.get('action', '')
@@ -299,21 +456,23 @@ def audit_log(request):
     if target_filter:
         entries = entries.filter(target_type=target_filter)
 
+    # Half-open local-day bounds on the raw column so the timestamp index
+    # is usable (a __date lookup wraps the column in a cast).
     date_from = request.GET.get('date_from', '')
-    if date_from:
-        entries = entries.filter(timestamp__date__gte=date_from)
+    day_start = _local_day_start(date_from)
+    if day_start:
+        entries = entries.filter(timestamp__gte=day_start)
 
     date_to = request.GET.get('date_to', '')
-    if date_to:
-        entries = entries.filter(timestamp__date__lte=date_to)
+    day_start = _local_day_start(date_to, offset_days=1)
+    if day_start:
+        entries = entries.filter(timestamp__lt=day_start)
 
     # Paginate
-    from django.core.paginator import Paginator
-    paginator = Paginator(entries, 50)
+    paginator = _CachedCountPaginator(entries, 50)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
 
-    from accounts.models import CustomUser
     action_choices = [
         'login', 'logout', 'create', 'update', 'delete',
         'approve', 'reject', 'abort', 'export',
@@ -322,7 +481,9 @@ def audit_log(request):
     return render(request, 'lab_ui/audit_log.html', {
         'page_obj': page_obj,
         'action_choices': action_choices,
-        'all_users': CustomUser.objects.filter(is_active=True).order_by('username'),
+        'all_users': cache.get_or_set(
+            ACTIVE_USERS_CACHE_KEY, _active_users, ACTIVE_USERS_TTL,
+        ),
         'filters': {
             'action': action_filter,
             'user': user_filter,
@@ -336,12 +497,10 @@ def audit_log(request):
 @role_required('admin', 'manager')
 def audit_export(request):
     """CSV export of audit log entries."""
-    try:
-        from audit.models import AuditEntry
-    except ImportError:
+    if AuditEntry is None:
         return StreamingHttpResponse('', content_type='text/csv')
 
-    entries = AuditEntry.objects.select_related('user').order_by('-timestamp')
+    entries = AuditEntry.objects.order_by('-timestamp')
 
     # Apply same filters as audit_log
     action_filter = request.GET.get('action', '')
@@ -351,17 +510,23 @@ def audit_export(request):
     if user_filter:
         entries = entries.filter(user_id=user_filter)
 
-    def generate():
-        yield 'Timestamp,User,Action,Target Type,Target ID,Description\n'
-        for e in entries.iterator():
-            user_str = e.user.username if e.user else 'system'
-            ts = e.timestamp.strftime('%Y-%m-%d %H:%M:%S')
-            desc = e.description.replace('"', '""')
-            yield f'{ts},{user_str},{e.action},{e.target_type},{e.target_id or ""},"{desc}"\n'
-
-    response = StreamingHttpResponse(generate(), content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="audit_log.csv"'
-    return response
+    # Plain tuples with the username joined in SQL — no model instances.
+    # iterator() streams through a server-side cursor on PostgreSQL
+    # (fetchmany on SQLite), so at most one chunk is held in memory.
+    rows = entries.values_list(
+        'timestamp', 'user__username', 'action',
+        'target_type', 'target_id', 'description',
+    ).iterator(chunk_size=2000)
+
+    return _csv_response(
+        'audit_log.csv',
+        ['Timestamp', 'User', 'Action', 'Target Type', 'Target ID', 'Description'],
+        (
+            (ts.strftime('%Y-%m-%d %H:%M:%S'), username or 'system', action,
+             target_type, '' if target_id is None else target_id, desc)
+            for ts, username, action, target_type, target_id, desc in rows
+        ),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -404,15 +569,20 @@ def lab_settings(request):
 #  T-506: CSV Export for test history
 # ---------------------------------------------------------------------------
 
+_STATUS_LABELS = dict(Test.STATUS_CHOICES)
+_SOURCE_LABELS = dict(Test.SOURCE_CHOICES)
+_APPROVAL_LABELS = dict(Test.APPROVAL_CHOICES)
+_RESULT_LABELS = {True: 'PASS', False: 'FAIL', None: ''}
+
+
 @login_required
 def test_export_csv(request):
     """Export filtered test list as CSV."""
-    tests = Test.objects.select_related('meter', 'initiated_by').order_by('-created_at')
+    tests = Test.objects.order_by('-created_at')
 
     # Apply same filters as test_list
     search = request.GET.get('q', '').strip()
     if search:
-        from django.db.models import Q
         q = Q(meter__serial_number__icontains=search) | Q(notes__icontains=search)
         if search.isdigit():
             q |= Q(pk=int(search))
@@ -428,31 +598,41 @@ def test_export_csv(request):
     elif result_filter == 'fail':
         tests = tests.filter(overall_pass=False)
 
-    def generate():
-        yield 'Test #,Meter,Size,Class,Status,Result,Source,Initiated By,Created,Completed,Approval,Certificate\n'
-        for t in tests.iterator():
-            result = 'PASS' if t.overall_pass is True else ('FAIL' if t.overall_pass is False else '')
-            user = t.initiated_by.username if t.initiated_by else ''
-            created = t.created_at.strftime('%Y-%m-%d %H:%M') if t.created_at else ''
-            completed = t.completed_at.strftime('%Y-%m-%d %H:%M') if t.completed_at else ''
+    # Tuples straight from SQL; display labels come from the choice maps
+    # instead of get_FOO_display() on hydrated models.
+    values = tests.values_list(
+        'pk', 'meter__serial_number', 'meter__meter_size', 'test_class',
+        'status', 'overall_pass', 'source', 'initiated_by__username',
+        'created_at', 'completed_at', 'approval_status', 'certificate_number',
+    ).iterator(chunk_size=2000)
+
+    def rows():
+        for (pk, serial, size, test_class, status, overall_pass, source, user,
+             created, completed, approval, cert) in values:
             yield (
-                f'{t.pk},{t.meter.serial_number},{t.meter.meter_size},{t.test_class},'
-                f'{t.get_status_display()},{result},{t.get_source_display()},'
-                f'{user},{created},{completed},'
-                f'{t.get_approval_status_display()},{t.certificate_number}\n'
+                pk, serial, size, test_class,
+                _STATUS_LABELS.get(status, status),
+                _RESULT_LABELS[overall_pass],
+                _SOURCE_LABELS.get(source, source),
+                user or '',
+                created.strftime('%Y-%m-%d %H:%M') if created else '',
+                completed.strftime('%Y-%m-%d %H:%M') if completed else '',
+                _APPROVAL_LABELS.get(approval, approval),
+                cert,
             )
 
-    response = StreamingHttpResponse(generate(), content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="test_history.csv"'
+    response = _csv_response(
+        'test_history.csv',
+        ['Test #', 'Meter', 'Size', 'Class', 'Status', 'Result', 'Source',
+         'Initiated By', 'Created', 'Completed', 'Approval', 'Certificate'],
+        rows(),
+    )
 
     # Audit log
-    try:
-        from audit.utils import log_audit
+    if log_audit is not None:
         log_audit(
             request.user, 'export', 'test', description='Exported test history CSV',
             ip_address=request.META.get('REMOTE_ADDR'),
         )
-    except Exception:
-        pass
 
     return response
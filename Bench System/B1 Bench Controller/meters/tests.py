@@ -1,3 +1,40 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-# Create your tests here.
+from accounts.models import CustomUser
+from meters.models import TestMeter
+from testing.models import Test
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class MeterDetailTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_user(
+            username='meteradmin', password='test123', role='admin',
+        )
+        cls.meter = TestMeter.objects.create(
+            serial_number='MTR-001', meter_size='DN15', meter_class='B',
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        self.url = reverse('meters:meter_detail', args=[self.meter.pk])
+
+    def _queries_for_detail(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_recent_tests_no_per_row_queries(self):
+        """Query count doesn't grow with the number of listed tests."""
+        Test.objects.create(meter=self.meter, initiated_by=self.admin)
+        self.client.get(self.url)  # first hit creates per-site settings rows
+        baseline = self._queries_for_detail()
+        for _ in range(5):
+            Test.objects.create(meter=self.meter, initiated_by=self.admin)
+        with self.assertNumQueries(baseline):
+            self.client.get(self.url)
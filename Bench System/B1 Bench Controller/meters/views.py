@@ -15,7 +15,12 @@ def meter_list(request):
 @login_required
 def meter_detail(request, pk):
     meter = get_object_or_404(TestMeter, pk=pk)
-    tests = meter.test_set.all()[:10]
+    # Only the columns the recent-tests list renders. meter_id stays loaded:
+    # the related manager stamps each row with its meter and would otherwise
+    # fetch the deferred FK once per row.
+    tests = meter.test_set.only(
+        'pk', 'meter', 'status', 'overall_pass', 'created_at',
+    ).order_by('-created_at')[:10]
     return render(request, 'meters/meter_detail.html', {
         'meter': meter,
         'tests': tests,
@@ -1,16 +1,95 @@
 """
 Matplotlib error curve generator for ISO 4064 test certificates.
 
-Produces a PNG image matching the Chart.js visualization in error_curve.js.
+Produces a PNG image (or a raw RGB image for PDF embedding) matching the
+Chart.js visualization in error_curve.js.
 Uses Agg backend for headless rendering (no display required).
+matplotlib itself is imported on the first render (~0.6 s), so processes
+that import this module but never draw a chart don't pay for it.
 """
 
+import functools
 import io
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.ticker as ticker
+import threading
+from collections import OrderedDict
+
 import numpy as np
+from PIL import Image
+
+
+@functools.cache
+def _matplotlib():
+    """(Figure, FigureCanvasAgg, ticker), imported once on first use."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.ticker as ticker
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    return Figure, FigureCanvasAgg, ticker
+
+# Figures are reused across calls (one per size, least recently used
+# evicted), since building the Figure/Axes artists dominates the cost of
+# plotting ~8 points. Rendering is serialized: matplotlib's font cache and
+# rcParams are process-global, so per-thread figures would not be safe either.
+_FIGURE_LOCK = threading.Lock()
+_FIGURES = OrderedDict()
+_MAX_FIGURES = 4
+
+
+def _figure(width, height, dpi):
+    """Cached (Figure, Axes) for a size; call with _FIGURE_LOCK held."""
+    key = (width, height, dpi)
+    if key in _FIGURES:
+        _FIGURES.move_to_end(key)
+        return _FIGURES[key]
+    Figure, FigureCanvasAgg, _ = _matplotlib()
+    fig = Figure(figsize=(width, height), dpi=dpi, facecolor='white')
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    fig.subplots_adjust(left=0.1, right=0.98, top=0.95, bottom=0.15)
+    _FIGURES[key] = (fig, ax)
+    if len(_FIGURES) > _MAX_FIGURES:
+        _FIGURES.popitem(last=False)
+    return fig, ax
+
+
+def _curve_data(q_points):
+    """Split Q-points into plot arrays.
+
+    Returns (pass_flows, pass_errors, fail_flows, fail_errors, mpe_flows,
+    mpe_upper) as float arrays. Points without an error or a positive flow
+    are dropped; the MPE envelope is sorted by flow with one value per flow
+    (the last Q-point's, as before).
+    """
+    # One pass over the Q-points into an (n, 4) array; the rest is NumPy
+    cols = np.array([
+        (
+            qp.target_flow_lph or qp.actual_flow_lph or 0.0,
+            np.nan if qp.error_pct is None else qp.error_pct,
+            qp.mpe_pct or 0.0,
+            bool(qp.passed),
+        )
+        for qp in q_points
+    ], dtype=np.float64).reshape(-1, 4)
+    flows, errors = cols[:, 0], cols[:, 1]
+    mpe = np.abs(cols[:, 2])
+    passed = cols[:, 3].astype(bool)
+
+    has_flow = flows > 0
+    plotted = has_flow & ~np.isnan(errors)
+    pass_mask = plotted & passed
+    fail_mask = plotted & ~passed
+
+    # np.unique keeps the first index per flow; reverse so the last one wins
+    mpe_mask = has_flow & (mpe > 0)
+    rev_flows, rev_mpe = flows[mpe_mask][::-1], mpe[mpe_mask][::-1]
+    mpe_flows, idx = np.unique(rev_flows, return_index=True)
+
+    return (
+        flows[pass_mask], errors[pass_mask],
+        flows[fail_mask], errors[fail_mask],
+        mpe_flows, rev_mpe[idx],
+    )
 
 
 def generate_error_curve_image(test_summary, width=7.0, height=3.5, dpi=150):
@@ -26,46 +105,55 @@ def generate_error_curve_image(test_summary, width=7.0, height=3.5, dpi=150):
     Returns:
         bytes: PNG image data
     """
-    q_points = test_summary.q_points
-
-    # Separate pass/fail points
-    pass_flows, pass_errors, pass_labels = [], [], []
-    fail_flows, fail_errors, fail_labels = [], [], []
-
-    for qp in q_points:
-        if qp.error_pct is None:
-            continue
-        flow = qp.target_flow_lph or qp.actual_flow_lph
-        if not flow or flow <= 0:
-            continue
-        if qp.passed:
-            pass_flows.append(flow)
-            pass_errors.append(qp.error_pct)
-            pass_labels.append(qp.q_point)
-        else:
-            fail_flows.append(flow)
-            fail_errors.append(qp.error_pct)
-            fail_labels.append(qp.q_point)
-
-    # Build MPE envelope from q_points (unique flow/mpe pairs, sorted)
-    mpe_map = {}
-    for qp in q_points:
-        flow = qp.target_flow_lph or qp.actual_flow_lph
-        if flow and flow > 0 and qp.mpe_pct:
-            mpe_map[flow] = abs(qp.mpe_pct)
-    mpe_flows = sorted(mpe_map.keys())
-    mpe_upper = [mpe_map[f] for f in mpe_flows]
-    mpe_lower = [-mpe_map[f] for f in mpe_flows]
-
-    # Create figure
-    fig, ax = plt.subplots(figsize=(width, height), dpi=dpi)
-    fig.patch.set_facecolor('white')
+    with _FIGURE_LOCK:
+        fig = _render(test_summary, width, height, dpi)
+        # dpi pinned so a matplotlibrc savefig.dpi can't force a resample;
+        # zlib level 1 (default 6): faster deflate for a slightly larger PNG
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=dpi, facecolor='white',
+                    pil_kwargs={'compress_level': 1})
+    return buf.getvalue()
+
+
+def render_error_curve(test_summary, width=7.0, height=3.5, dpi=150):
+    """
+    Rasterize the error curve to an RGB PIL image, without PNG encoding.
+
+    For embedding in the PDF, which compresses the raw pixels itself;
+    a PNG would only be decoded again by ReportLab.
+    """
+    with _FIGURE_LOCK:
+        fig = _render(test_summary, width, height, dpi)
+        fig.canvas.draw()
+        rgba = fig.canvas.buffer_rgba()
+        # convert() copies, so the image outlives the reused canvas buffer
+        return Image.frombuffer(
+            'RGBA', (rgba.shape[1], rgba.shape[0]), rgba, 'raw', 'RGBA', 0, 1,
+        ).convert('RGB')
+
+
+def _render(test_summary, width, height, dpi):
+    """Draw the curve onto the cached figure; call with _FIGURE_LOCK held."""
+    pass_flows, pass_errors, fail_flows, fail_errors, mpe_flows, mpe_upper = (
+        _curve_data(test_summary.q_points)
+    )
+    fig, ax = _figure(width, height, dpi)
+    ax.clear()
     ax.set_facecolor('white')
+    # Fixed margins (set once in _figure): tight_layout / bbox_inches='tight'
+    # each cost an extra layout or render pass
+    _draw_curve(ax, pass_flows, pass_errors, fail_flows, fail_errors,
+                mpe_flows, mpe_upper, -mpe_upper)
+    return fig
+
 
+def _draw_curve(ax, pass_flows, pass_errors, fail_flows, fail_errors,
+                mpe_flows, mpe_upper, mpe_lower):
+    """Draw the envelope, points and styling onto a cleared Axes."""
     # MPE envelope (dashed red with fill between)
     mpe_color = (239/255, 68/255, 68/255, 0.6)
     mpe_fill = (239/255, 68/255, 68/255, 0.05)
-    if mpe_flows:
+    if mpe_flows.size:
         ax.plot(mpe_flows, mpe_upper, color=mpe_color, linewidth=2,
                 linestyle='--', label='MPE Limit', zorder=1)
         ax.plot(mpe_flows, mpe_lower, color=mpe_color, linewidth=2,
@@ -74,12 +162,12 @@ def generate_error_curve_image(test_summary, width=7.0, height=3.5, dpi=150):
                         color=mpe_fill, zorder=0)
 
     # Pass points (green circles)
-    if pass_flows:
+    if pass_flows.size:
         ax.scatter(pass_flows, pass_errors, c='#10b981', edgecolors='#059669',
                    linewidths=1.5, s=60, zorder=3, label='Pass')
 
     # Fail points (red X markers)
-    if fail_flows:
+    if fail_flows.size:
         ax.scatter(fail_flows, fail_errors, c='#ef4444', edgecolors='#dc2626',
                    linewidths=1.5, s=60, marker='X', zorder=3, label='Fail')
 
@@ -98,18 +186,17 @@ def generate_error_curve_image(test_summary, width=7.0, height=3.5, dpi=150):
     ax.grid(True, which='minor', color=(0, 0, 0, 0.02), linewidth=0.3)
 
     # Tick styling
+    ticker = _matplotlib()[2]
     ax.tick_params(axis='both', labelsize=9, colors='#94a3b8')
     ax.xaxis.set_major_formatter(ticker.ScalarFormatter())
     ax.xaxis.get_major_formatter().set_scientific(False)
     ax.yaxis.set_major_formatter(ticker.PercentFormatter(decimals=0))
 
     # Y-axis padding
-    all_errors = pass_errors + fail_errors
-    if all_errors and mpe_upper:
-        y_max = max(max(abs(e) for e in all_errors), max(mpe_upper))
-        ax.set_ylim(-y_max * 1.3, y_max * 1.3)
-    elif mpe_upper:
-        y_max = max(mpe_upper)
+    if mpe_upper.size:
+        y_max = mpe_upper.max()
+        if pass_errors.size or fail_errors.size:
+            y_max = max(y_max, np.abs(np.concatenate((pass_errors, fail_errors))).max())
         ax.set_ylim(-y_max * 1.3, y_max * 1.3)
 
     # Legend
@@ -122,12 +209,3 @@ def generate_error_curve_image(test_summary, width=7.0, height=3.5, dpi=150):
     for spine in ax.spines.values():
         spine.set_color('#e2e8f0')
         spine.set_linewidth(0.8)
-
-    plt.tight_layout(pad=0.5)
-
-    # Render to PNG bytes
-    buf = io.BytesIO()
-    fig.savefig(buf, format='png', bbox_inches='tight', facecolor='white')
-    plt.close(fig)
-    buf.seek(0)
-    return buf.read()
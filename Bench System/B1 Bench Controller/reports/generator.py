@@ -11,23 +11,31 @@ Uses ReportLab to produce A4 certificates with:
 """
 
 import io
+import multiprocessing
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+import django
 from django.conf import settings
+from django.db.models import Prefetch
 
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import mm, cm
+from reportlab.lib.utils import ImageReader
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image,
-    HRFlowable, KeepTogether,
+    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Flowable,
+    HRFlowable, KeepTogether, PageBreak,
 )
 
+from testing.models import Test, TestResult
 from testing.services import get_test_summary
-from reports.error_curve import generate_error_curve_image
+from reports.error_curve import render_error_curve
 
 
 # --- Colors ---
@@ -95,9 +103,105 @@ def _styles():
             fontName='Helvetica', fontSize=7,
             textColor=MUTED, alignment=TA_CENTER,
         ),
+        # Results table cells
+        'th': ParagraphStyle(
+            'TH', fontName='Helvetica-Bold', fontSize=8,
+            textColor=MUTED, alignment=TA_CENTER, leading=10,
+        ),
+        'td': ParagraphStyle(
+            'TD', fontName='Helvetica', fontSize=9,
+            textColor=DARK, alignment=TA_CENTER, leading=11,
+        ),
+        'td_pass': ParagraphStyle(
+            'TDPass', fontName='Helvetica-Bold', fontSize=9,
+            textColor=PASS_GREEN, alignment=TA_CENTER,
+        ),
+        'td_fail': ParagraphStyle(
+            'TDFail', fontName='Helvetica-Bold', fontSize=9,
+            textColor=FAIL_RED, alignment=TA_CENTER,
+        ),
     }
 
 
+# Built once and shared by every render; the styles are never mutated.
+_STYLES = _styles()
+
+# Centred single-line error statistics
+_STATS_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('TEXTCOLOR', (0, 0), (-1, -1), MUTED),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 0),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+    ('TOPPADDING', (0, 0), (-1, -1), 0),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+])
+
+
+# Parsed markup for constant paragraph text, keyed by (text, style name).
+# Paragraph() parses its text on construction; fragments are read-only
+# afterwards, so each certificate builds fresh Paragraphs from these.
+_FIXED_FRAGS = {}
+
+
+def _fixed(text, style):
+    """Paragraph for constant text, parsing its markup only once."""
+    key = (text, style.name)
+    frags = _FIXED_FRAGS.get(key)
+    if frags is None:
+        frags = _FIXED_FRAGS[key] = Paragraph(text, style).frags
+    return Paragraph(text, style, frags=frags)
+
+
+# Rendered error curves keyed by the plotted values, so a reprint or
+# batch re-export of an unchanged test skips matplotlib entirely.
+# Each entry is ~0.6 MB of RGB pixels at 96 dpi; keep the LRU small.
+_CHART_LOCK = threading.Lock()
+_CHARTS = OrderedDict()
+_MAX_CHARTS = 16
+
+
+def _chart_reader(summary):
+    """ImageReader for the summary's error curve, rendered once per curve.
+
+    Rendered at CERT_CHART_DPI (default 96): the chart is placed at
+    165 x 75 mm, and Agg time grows with the pixel count.
+    """
+    dpi = getattr(settings, 'CERT_CHART_DPI', 96)
+    key = (dpi, *(
+        (qp.target_flow_lph, qp.actual_flow_lph, qp.error_pct, qp.mpe_pct, qp.passed)
+        for qp in summary.q_points
+    ))
+    with _CHART_LOCK:
+        reader = _CHARTS.get(key)
+        if reader is not None:
+            _CHARTS.move_to_end(key)
+            return reader
+    reader = ImageReader(render_error_curve(summary, width=7.0, height=3.2, dpi=dpi))
+    with _CHART_LOCK:
+        _CHARTS[key] = reader
+        if len(_CHARTS) > _MAX_CHARTS:
+            _CHARTS.popitem(last=False)
+    return reader
+
+
+class _RasterImage(Flowable):
+    """Draws an in-memory PIL image or ImageReader (platypus Image wants a file or path)."""
+
+    def __init__(self, image, width, height):
+        super().__init__()
+        self._reader = ImageReader(image)
+        self.width, self.height = width, height
+        self.hAlign = 'CENTER'
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        self.canv.drawImage(self._reader, 0, 0, self.width, self.height)
+
+
 def _detail_row(label, value, styles):
     """Build a two-column detail row."""
     return [
@@ -106,33 +210,73 @@ def _detail_row(label, value, styles):
     ]
 
 
-def generate_certificate_pdf(test) -> bytes:
+def generate_certificate_pdf(test, out=None, summary=None) -> bytes | None:
     """Generate a complete A4 PDF certificate for a test.
 
     Args:
-        test: testing.models.Test instance (must have results populated)
+        test: testing.models.Test instance (must have results populated);
+            for batches, fetch via iter_tests_for_certs() to avoid N+1
+        out: Optional binary file object to write the PDF to
+        summary: Optional TestSummary the caller already built for this
+            test; shared with the error curve instead of rebuilt
 
     Returns:
-        bytes: PDF file content
+        bytes: PDF file content, or None when written to ``out``
     """
-    summary = get_test_summary(test)
-    st = _styles()
-    buf = io.BytesIO()
+    if summary is None:
+        summary = get_test_summary(test)
+    buf = out if out is not None else io.BytesIO()
+    _certificate_doc(buf).build(_certificate_story(test, summary))
+    if out is not None:
+        return None
+    return buf.getvalue()
+
+
+def generate_certificates_pdf(tests, out=None) -> bytes | None:
+    """Generate one PDF holding the certificates of several tests, for printing.
+
+    Each certificate starts on a new page. One document build shares the
+    PDF setup (fonts, resources, metadata) across the whole batch.
 
-    doc = SimpleDocTemplate(
+    Args:
+        tests: Test instances, e.g. from iter_tests_for_certs()
+        out: Optional binary file object to write the PDF to
+
+    Returns:
+        bytes: PDF file content, or None when written to ``out``
+    """
+    elements = []
+    for test in tests:
+        if elements:
+            elements.append(PageBreak())
+        elements.extend(_certificate_story(test, get_test_summary(test)))
+    buf = out if out is not None else io.BytesIO()
+    _certificate_doc(buf).build(elements)
+    if out is not None:
+        return None
+    return buf.getvalue()
+
+
+def _certificate_doc(buf):
+    """A4 document template for certificates (base-14 fonts only, nothing to register)."""
+    return SimpleDocTemplate(
         buf, pagesize=A4,
         topMargin=15*mm, bottomMargin=15*mm,
         leftMargin=18*mm, rightMargin=18*mm,
     )
 
+
+def _certificate_story(test, summary):
+    """Flowables for one certificate."""
+    st = _STYLES
     elements = []
 
     # --- Header ---
-    elements.append(Paragraph(
+    elements.append(_fixed(
         'IIIT Bengaluru — Water Meter Calibration Laboratory',
         st['title']
     ))
-    elements.append(Paragraph(
+    elements.append(_fixed(
         'Test Certificate — ISO 4064 Compliance',
         st['subtitle']
     ))
@@ -149,9 +293,9 @@ def generate_certificate_pdf(test) -> bytes:
         cert_date = test.started_at.strftime('%d %B %Y, %H:%M')
 
     info_data = [
-        [Paragraph('Certificate No.', st['label']),
+        [_fixed('Certificate No.', st['label']),
          Paragraph(cert_number, st['value']),
-         Paragraph('Date', st['label']),
+         _fixed('Date', st['label']),
          Paragraph(cert_date, st['value'])],
     ]
     info_table = Table(info_data, colWidths=[30*mm, 55*mm, 25*mm, 55*mm])
@@ -163,20 +307,20 @@ def generate_certificate_pdf(test) -> bytes:
     elements.append(Spacer(1, 3*mm))
 
     # --- Meter Details ---
-    elements.append(Paragraph('Meter Under Test', st['section']))
+    elements.append(_fixed('Meter Under Test', st['section']))
     meter = test.meter
     meter_data = [
-        [Paragraph('Serial Number', st['label']),
+        [_fixed('Serial Number', st['label']),
          Paragraph(meter.serial_number, st['value']),
-         Paragraph('Size', st['label']),
+         _fixed('Size', st['label']),
          Paragraph(meter.meter_size, st['value'])],
-        [Paragraph('Manufacturer', st['label']),
+        [_fixed('Manufacturer', st['label']),
          Paragraph(meter.manufacturer or '—', st['value']),
-         Paragraph('Model', st['label']),
+         _fixed('Model', st['label']),
          Paragraph(meter.model_name or '—', st['value'])],
-        [Paragraph('Type', st['label']),
+        [_fixed('Type', st['label']),
          Paragraph(meter.get_meter_type_display(), st['value']),
-         Paragraph('Test Class', st['label']),
+         _fixed('Test Class', st['label']),
          Paragraph(summary.test_class, st['value'])],
     ]
     meter_table = Table(meter_data, colWidths=[30*mm, 55*mm, 25*mm, 55*mm])
@@ -187,19 +331,19 @@ def generate_certificate_pdf(test) -> bytes:
     elements.append(meter_table)
 
     # --- Test Info ---
-    elements.append(Paragraph('Test Information', st['section']))
+    elements.append(_fixed('Test Information', st['section']))
     started = test.started_at.strftime('%d %b %Y, %H:%M:%S') if test.started_at else '—'
     completed = test.completed_at.strftime('%d %b %Y, %H:%M:%S') if test.completed_at else '—'
     initiated = test.initiated_by.get_full_name() or test.initiated_by.username if test.initiated_by else '—'
 
     test_data = [
-        [Paragraph('Started', st['label']),
+        [_fixed('Started', st['label']),
          Paragraph(started, st['value']),
-         Paragraph('Completed', st['label']),
+         _fixed('Completed', st['label']),
          Paragraph(completed, st['value'])],
-        [Paragraph('Initiated By', st['label']),
+        [_fixed('Initiated By', st['label']),
          Paragraph(initiated, st['value']),
-         Paragraph('Source', st['label']),
+         _fixed('Source', st['label']),
          Paragraph(test.get_source_display(), st['value'])],
     ]
     test_table = Table(test_data, colWidths=[30*mm, 55*mm, 25*mm, 55*mm])
@@ -210,38 +354,24 @@ def generate_certificate_pdf(test) -> bytes:
     elements.append(test_table)
 
     # --- Results Table ---
-    elements.append(Paragraph('Q-Point Results', st['section']))
+    elements.append(_fixed('Q-Point Results', st['section']))
 
     # Table header
     header = ['Q-Point', 'Zone', 'Target\n(L/h)', 'Ref Vol\n(L)',
               'DUT Vol\n(L)', 'Error\n(%)', 'MPE\n(%)', 'Result']
 
-    header_style = ParagraphStyle(
-        'TH', fontName='Helvetica-Bold', fontSize=8,
-        textColor=MUTED, alignment=TA_CENTER, leading=10,
-    )
-    cell_style = ParagraphStyle(
-        'TD', fontName='Helvetica', fontSize=9,
-        textColor=DARK, alignment=TA_CENTER, leading=11,
-    )
-    pass_style = ParagraphStyle(
-        'TDPass', fontName='Helvetica-Bold', fontSize=9,
-        textColor=PASS_GREEN, alignment=TA_CENTER,
-    )
-    fail_style = ParagraphStyle(
-        'TDFail', fontName='Helvetica-Bold', fontSize=9,
-        textColor=FAIL_RED, alignment=TA_CENTER,
-    )
+    header_style, cell_style = st['th'], st['td']
+    pass_style, fail_style = st['td_pass'], st['td_fail']
 
-    table_data = [[Paragraph(h, header_style) for h in header]]
+    table_data = [[_fixed(h, header_style) for h in header]]
 
     for qp in summary.q_points:
         if qp.passed is True:
-            result_cell = Paragraph('PASS', pass_style)
+            result_cell = _fixed('PASS', pass_style)
         elif qp.passed is False:
-            result_cell = Paragraph('FAIL', fail_style)
+            result_cell = _fixed('FAIL', fail_style)
         else:
-            result_cell = Paragraph('—', cell_style)
+            result_cell = _fixed('—', cell_style)
 
         row = [
             Paragraph(qp.q_point, cell_style),
@@ -276,36 +406,31 @@ def generate_certificate_pdf(test) -> bytes:
     elements.append(results_table)
 
     # --- Error Curve Chart ---
-    elements.append(Paragraph('Error Curve', st['section']))
+    elements.append(_fixed('Error Curve', st['section']))
     try:
-        chart_png = generate_error_curve_image(summary, width=7.0, height=3.2, dpi=150)
-        chart_image = Image(io.BytesIO(chart_png), width=165*mm, height=75*mm)
-        elements.append(chart_image)
+        elements.append(_RasterImage(_chart_reader(summary), width=165*mm, height=75*mm))
     except Exception:
-        elements.append(Paragraph(
+        elements.append(_fixed(
             '<i>Error curve chart could not be generated.</i>', st['small']
         ))
 
     # --- Zone Verdicts ---
     elements.append(Spacer(1, 3*mm))
-    zone_data = []
-    if summary.lower_zone_pass is not None:
-        lz = 'PASS' if summary.lower_zone_pass else 'FAIL'
-        lz_style = pass_style if summary.lower_zone_pass else fail_style
-        zone_data.append([
-            Paragraph('Lower Zone (Q1-Q3)', cell_style),
-            Paragraph(lz, lz_style),
-        ])
-    if summary.upper_zone_pass is not None:
-        uz = 'PASS' if summary.upper_zone_pass else 'FAIL'
-        uz_style = pass_style if summary.upper_zone_pass else fail_style
-        zone_data.append([
-            Paragraph('Upper Zone (Q4-Q8)', cell_style),
-            Paragraph(uz, uz_style),
-        ])
+    zone_data = [
+        [label, _fixed('PASS', pass_style) if passed else _fixed('FAIL', fail_style)]
+        for label, passed in (
+            ('Lower Zone (Q1-Q3)', summary.lower_zone_pass),
+            ('Upper Zone (Q4-Q8)', summary.upper_zone_pass),
+        )
+        if passed is not None
+    ]
     if zone_data:
         zone_table = Table(zone_data, colWidths=[50*mm, 30*mm])
         zone_table.setStyle(TableStyle([
+            # Plain-string labels, styled like the 'td' paragraphs
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (0, -1), 9),
+            ('TEXTCOLOR', (0, 0), (0, -1), DARK),
             ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 2*mm),
@@ -318,37 +443,41 @@ def generate_certificate_pdf(test) -> bytes:
         width='100%', thickness=1, color=BORDER, spaceAfter=4*mm
     ))
     if summary.overall_pass is True:
-        elements.append(Paragraph('OVERALL VERDICT: PASS', st['verdict_pass']))
+        elements.append(_fixed('OVERALL VERDICT: PASS', st['verdict_pass']))
     elif summary.overall_pass is False:
-        elements.append(Paragraph('OVERALL VERDICT: FAIL', st['verdict_fail']))
+        elements.append(_fixed('OVERALL VERDICT: FAIL', st['verdict_fail']))
     else:
-        elements.append(Paragraph('OVERALL VERDICT: INCOMPLETE', st['subtitle']))
+        elements.append(_fixed('OVERALL VERDICT: INCOMPLETE', st['subtitle']))
 
     # --- Error Statistics ---
     if summary.min_error_pct is not None:
         elements.append(Spacer(1, 3*mm))
+        # One plain line: a string cell skips Paragraph's markup parse,
+        # with literal no-break spaces in place of &nbsp;
         stats_text = (
             f'Error range: {summary.min_error_pct:+.3f}% to {summary.max_error_pct:+.3f}%'
-            f' &nbsp;|&nbsp; Average: {summary.avg_error_pct:+.3f}%'
-            f' &nbsp;|&nbsp; Points: {summary.passed_points} pass, '
+            f' \u00a0|\u00a0 Average: {summary.avg_error_pct:+.3f}%'
+            f' \u00a0|\u00a0 Points: {summary.passed_points} pass, '
             f'{summary.failed_points} fail of {summary.total_points}'
         )
-        elements.append(Paragraph(stats_text, ParagraphStyle(
-            'Stats', fontName='Helvetica', fontSize=9,
-            textColor=MUTED, alignment=TA_CENTER,
-        )))
+        stats_table = Table([[stats_text]])
+        stats_table.setStyle(_STATS_TABLE_STYLE)
+        elements.append(stats_table)
 
     # --- Signature Line ---
     elements.append(Spacer(1, 12*mm))
     sig_data = [
-        [Paragraph('', st['normal']), Paragraph('', st['normal'])],
-        [Paragraph('_' * 35, st['normal']),
-         Paragraph('_' * 35, st['normal'])],
-        [Paragraph('Tested By', st['small']),
-         Paragraph('Approved By', st['small'])],
+        ['', ''],
+        [HRFlowable(width=70*mm, thickness=0.5, color=DARK),
+         HRFlowable(width=70*mm, thickness=0.5, color=DARK)],
+        ['Tested By', 'Approved By'],
     ]
     sig_table = Table(sig_data, colWidths=[80*mm, 80*mm])
     sig_table.setStyle(TableStyle([
+        # Rules are drawn, not typed as underscores; labels are plain strings
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 2), (-1, 2), 8),
+        ('TEXTCOLOR', (0, 2), (-1, 2), MUTED),
         ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
         ('TOPPADDING', (0, 0), (-1, -1), 1*mm),
     ]))
@@ -359,40 +488,107 @@ def generate_certificate_pdf(test) -> bytes:
     elements.append(HRFlowable(
         width='100%', thickness=0.5, color=BORDER, spaceAfter=2*mm
     ))
-    elements.append(Paragraph(
+    elements.append(_fixed(
         'This certificate is issued by the IIIT Bengaluru Water Meter Calibration Laboratory. '
         'Test performed in accordance with IS/ISO 4064-1:2014. '
         'This document is electronically generated and valid without signature.',
         st['footer']
     ))
 
-    doc.build(elements)
-    buf.seek(0)
-    return buf.read()
+    return elements
+
+
+def certificate_filename(test) -> str:
+    """Download/storage filename for a test's certificate PDF."""
+    return f'{test.certificate_number or f"test_{test.pk}"}.pdf'
 
 
-def save_certificate(test) -> str:
+def save_certificate(test, summary=None) -> str:
     """Generate and save a certificate PDF to MEDIA_ROOT.
 
     Args:
         test: testing.models.Test instance
+        summary: Optional TestSummary to reuse (see generate_certificate_pdf)
 
     Returns:
         str: Relative path to the saved PDF (for storage in test.certificate_pdf)
     """
-    pdf_bytes = generate_certificate_pdf(test)
-
     cert_dir = os.path.join(settings.MEDIA_ROOT, 'certificates')
     os.makedirs(cert_dir, exist_ok=True)
 
-    filename = f'{test.certificate_number or f"test_{test.pk}"}.pdf'
+    filename = certificate_filename(test)
     filepath = os.path.join(cert_dir, filename)
 
-    with open(filepath, 'wb') as f:
-        f.write(pdf_bytes)
+    # ReportLab writes straight into the file; the temp name + rename keeps
+    # a failed render from leaving a truncated certificate behind
+    tmp_path = f'{filepath}.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            generate_certificate_pdf(test, out=f, summary=summary)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
     rel_path = f'certificates/{filename}'
     test.certificate_pdf = rel_path
     test.save(update_fields=['certificate_pdf'])
 
     return rel_path
+
+
+# ---------------------------------------------------------------------------
+#  Batch rendering — certificate packs
+# ---------------------------------------------------------------------------
+
+def iter_tests_for_certs(test_ids):
+    """Tests by id with everything a certificate reads, in two queries.
+
+    generate_certificate_pdf() on these instances issues no further queries.
+    """
+    return Test.objects.filter(pk__in=test_ids).select_related(
+        'meter', 'initiated_by', 'approved_by',
+    ).prefetch_related(
+        Prefetch('results', queryset=TestResult.objects.order_by('q_point')),
+    )
+
+
+def _cert_workers(max_workers, count):
+    """Worker count for a batch of `count` certificates."""
+    if max_workers is None:
+        max_workers = getattr(settings, 'CERT_BATCH_WORKERS', None) or os.cpu_count() or 1
+    return min(max_workers, count)
+
+
+def _cert_pool(max_workers):
+    # spawn, not fork: the parent may be a threaded server holding DB
+    # connections and locks; workers set Django up from scratch
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=django.setup,
+    )
+
+
+def save_certificate_by_id(test_id: int) -> str:
+    """save_certificate() by test id; top-level so it can run in a worker."""
+    return save_certificate(iter_tests_for_certs([test_id]).get())
+
+
+def save_certificates_bulk(test_ids, max_workers=None) -> list[str]:
+    """Generate and save certificates for many tests, e.g. a full re-export.
+
+    Rendering is CPU-bound (ReportLab + matplotlib), so batches fan out
+    to a process pool of CERT_BATCH_WORKERS (default: CPU count); each
+    worker writes its own file and updates its own row. With one worker
+    or one id, renders inline. Returns the relative paths in order.
+    """
+    test_ids = list(test_ids)
+    max_workers = _cert_workers(max_workers, len(test_ids))
+    if max_workers <= 1:
+        tests = {t.pk: t for t in iter_tests_for_certs(test_ids)}
+        return [save_certificate(tests[test_id]) for test_id in test_ids]
+
+    with _cert_pool(max_workers) as pool:
+        return list(pool.map(save_certificate_by_id, test_ids, chunksize=4))
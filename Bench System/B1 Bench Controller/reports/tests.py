@@ -1,9 +1,12 @@
 """Tests for the reports app — error curve and PDF certificate generation."""
 
+import io
 import os
 import tempfile
+import zipfile
 from unittest.mock import patch
 
+from asgiref.sync import async_to_sync
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.test import TestCase, override_settings
@@ -11,13 +14,17 @@ from django.test import TestCase, override_settings
 from meters.models import TestMeter
 from testing.models import Test, TestResult, ISO4064Standard
 from testing.services import get_test_summary, generate_certificate_number
-from reports.error_curve import generate_error_curve_image
-from reports.generator import generate_certificate_pdf, save_certificate
+from reports.error_curve import _curve_data, generate_error_curve_image, render_error_curve
+from reports.generator import (
+    generate_certificate_pdf, iter_tests_for_certs, save_certificate,
+    save_certificates_bulk, generate_certificates_pdf, _chart_reader,
+)
 
 
 User = get_user_model()
 
 
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
 class ReportTestBase(TestCase):
     """Shared setup: user, meter, test with 8 Q-point results."""
 
@@ -47,12 +54,14 @@ class ReportTestBase(TestCase):
             ('Q7', 'Upper', 1500.0, 100.0, 240, 2.0),
             ('Q8', 'Upper', 3000.0, 200.0, 240, 2.0),
         ]
-        for qp, zone, flow, vol, dur, mpe in q_specs:
-            ISO4064Standard.objects.create(
+        ISO4064Standard.objects.bulk_create([
+            ISO4064Standard(
                 meter_size='DN15', meter_class='B', q_point=qp,
                 flow_rate_lph=flow, test_volume_l=vol,
                 duration_s=dur, mpe_pct=mpe, zone=zone,
             )
+            for qp, zone, flow, vol, dur, mpe in q_specs
+        ])
 
         from django.utils import timezone
         cls.test = Test.objects.create(
@@ -76,17 +85,32 @@ class ReportTestBase(TestCase):
             ('Q7', 'Upper', 1500.0, 100.0, 99.99, 100.05, 0.060, 2.0, True, 20.5, 99.99),
             ('Q8', 'Upper', 3000.0, 200.0, 200.00, 200.10, 0.050, 2.0, True, 20.5, 200.00),
         ]
-        for qp, zone, flow, actual, ref, dut, err, mpe, passed, temp, wt in results_data:
-            TestResult.objects.create(
+        TestResult.objects.bulk_create([
+            TestResult(
                 test=cls.test, q_point=qp, target_flow_lph=flow,
                 actual_flow_lph=actual, ref_volume_l=ref, dut_volume_l=dut,
                 error_pct=err, mpe_pct=mpe, passed=passed, zone=zone,
                 temperature_c=temp, weight_kg=wt,
             )
+            for qp, zone, flow, actual, ref, dut, err, mpe, passed, temp, wt in results_data
+        ])
 
 
 class TestErrorCurve(ReportTestBase):
-    """Tests for reports/error_curve.py."""
+    """Tests for reports/error_curve.py.
+
+    The matplotlib import and the default-size figure are warmed once per
+    class; the tests then share the module's figure pool like production.
+    MPLCONFIGDIR is left alone: a fresh directory would force matplotlib to
+    rebuild its font cache on every run.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from reports import error_curve
+        with error_curve._FIGURE_LOCK:
+            error_curve._figure(7.0, 3.5, 150)
 
     def test_returns_valid_png_bytes(self):
         summary = get_test_summary(self.test)
@@ -115,6 +139,64 @@ class TestErrorCurve(ReportTestBase):
         result = generate_error_curve_image(summary, width=5.0, height=2.5, dpi=72)
         self.assertTrue(result.startswith(b'\x89PNG'))
 
+    def test_reused_figure_does_not_leak_between_calls(self):
+        summary = get_test_summary(self.test)
+        first = generate_error_curve_image(summary)
+        other = get_test_summary(self.test)
+        other.q_points = other.q_points[:2]
+        self.assertNotEqual(generate_error_curve_image(other), first)
+        self.assertEqual(generate_error_curve_image(summary), first)
+
+    def test_render_for_pdf_is_rgb_raster(self):
+        summary = get_test_summary(self.test)
+        image = render_error_curve(summary, width=5.0, height=2.0, dpi=100)
+        self.assertEqual(image.mode, 'RGB')
+        self.assertEqual(image.size, (500, 200))
+
+    def test_matplotlib_imported_lazily(self):
+        import subprocess
+        import sys
+        code = (
+            'import sys; import reports.error_curve; '
+            'assert "matplotlib" not in sys.modules'
+        )
+        subprocess.run([sys.executable, '-c', code], check=True, cwd=settings.BASE_DIR)
+
+    def test_png_rendered_in_a_single_pass(self):
+        from matplotlib.figure import Figure
+        summary = get_test_summary(self.test)
+        with patch.object(Figure, 'tight_layout') as tight, \
+                patch.object(Figure, 'draw', autospec=True, side_effect=Figure.draw) as draw:
+            generate_error_curve_image(summary)
+        tight.assert_not_called()
+        self.assertEqual(draw.call_count, 1)
+
+    def test_figure_cache_reuses_and_evicts_lru(self):
+        from reports import error_curve
+        summary = get_test_summary(self.test)
+        with patch.object(error_curve, '_FIGURES', error_curve.OrderedDict()):
+            generate_error_curve_image(summary, dpi=72)
+            fig = error_curve._FIGURES[(7.0, 3.5, 72)][0]
+            generate_error_curve_image(summary, dpi=72)
+            self.assertIs(error_curve._FIGURES[(7.0, 3.5, 72)][0], fig)
+            for w in (1.0, 2.0, 3.0, 4.0):
+                generate_error_curve_image(summary, width=w, dpi=20)
+            self.assertEqual(len(error_curve._FIGURES), error_curve._MAX_FIGURES)
+            self.assertNotIn((7.0, 3.5, 72), error_curve._FIGURES)
+
+    def test_curve_data_split_and_envelope(self):
+        summary = get_test_summary(self.test)
+        summary.q_points[0].error_pct = None
+        summary.q_points[1].passed = False
+        summary.q_points[2].target_flow_lph = 0.0
+        summary.q_points[2].actual_flow_lph = None
+        pf, pe, ff, fe, mf, mu = _curve_data(summary.q_points)
+        self.assertEqual(list(ff), [22.5])
+        self.assertEqual(list(fe), [0.401])
+        self.assertEqual(list(pf), [60.0, 120.0, 750.0, 1500.0, 3000.0])
+        self.assertEqual(list(mf), [15.0, 22.5, 60.0, 120.0, 750.0, 1500.0, 3000.0])
+        self.assertEqual(list(mu), [5.0, 5.0, 2.0, 2.0, 2.0, 2.0, 2.0])
+
 
 class TestPDFGenerator(ReportTestBase):
     """Tests for reports/generator.py."""
@@ -125,6 +207,33 @@ class TestPDFGenerator(ReportTestBase):
         self.assertTrue(result.startswith(b'%PDF'), "Should produce valid PDF")
         self.assertGreater(len(result), 5000, "PDF should have substantial content")
 
+    def test_reprint_reuses_rendered_chart(self):
+        with patch.dict('reports.generator._CHARTS', clear=True), \
+                patch('reports.generator.render_error_curve', wraps=render_error_curve) as mock_render:
+            first = generate_certificate_pdf(self.test)
+            second = generate_certificate_pdf(self.test)
+        self.assertEqual(mock_render.call_count, 1)
+        self.assertEqual(len(first), len(second))
+
+    def test_chart_dpi_setting(self):
+        summary = get_test_summary(self.test)
+        for dpi in (96, 150):
+            with self.settings(CERT_CHART_DPI=dpi), patch.dict('reports.generator._CHARTS', clear=True):
+                reader = _chart_reader(summary)
+            self.assertEqual(reader.getSize(), (int(7.0 * dpi), int(3.2 * dpi)))
+
+    def test_pdf_reuses_given_summary(self):
+        summary = get_test_summary(self.test)
+        with patch('reports.generator.get_test_summary') as mock_summary:
+            pdf = generate_certificate_pdf(self.test, summary=summary)
+        mock_summary.assert_not_called()
+        self.assertTrue(pdf.startswith(b'%PDF'))
+
+    def test_pdf_written_to_stream(self):
+        buf = io.BytesIO()
+        self.assertIsNone(generate_certificate_pdf(self.test, out=buf))
+        self.assertTrue(buf.getvalue().startswith(b'%PDF'))
+
     def test_pdf_with_certificate_number(self):
         generate_certificate_number(self.test)
         self.test.refresh_from_db()
@@ -146,6 +255,14 @@ class TestPDFGenerator(ReportTestBase):
 class TestSaveCertificate(ReportTestBase):
     """Tests for save_certificate()."""
 
+    def test_failed_render_leaves_no_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with self.settings(MEDIA_ROOT=tmpdir):
+                with patch('reports.generator.SimpleDocTemplate.build', side_effect=RuntimeError):
+                    with self.assertRaises(RuntimeError):
+                        save_certificate(self.test)
+                self.assertEqual(os.listdir(os.path.join(tmpdir, 'certificates')), [])
+
     def test_saves_pdf_file_to_disk(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             with self.settings(MEDIA_ROOT=tmpdir):
@@ -161,14 +278,14 @@ class TestSaveCertificate(ReportTestBase):
                 self.assertTrue(os.path.isfile(full_path))
 
                 with open(full_path, 'rb') as f:
-                    self.assertTrue(f.read(4) == b'%PDF')
+                    self.assertEqual(f.read(4), b'%PDF')
 
 
 class TestDownloadCertificateView(ReportTestBase):
     """Tests for the download_certificate view."""
 
     def test_download_returns_404_without_certificate(self):
-        self.client.login(username='tech', password='testpass')
+        self.client.force_login(self.user)
         resp = self.client.get(f'/tests/{self.test.pk}/certificate/')
         self.assertEqual(resp.status_code, 404)
 
@@ -179,7 +296,135 @@ class TestDownloadCertificateView(ReportTestBase):
                 self.test.refresh_from_db()
                 save_certificate(self.test)
 
-                self.client.login(username='tech', password='testpass')
+                self.client.force_login(self.user)
                 resp = self.client.get(f'/tests/{self.test.pk}/certificate/')
                 self.assertEqual(resp.status_code, 200)
                 self.assertEqual(resp['Content-Type'], 'application/pdf')
+
+
+class _InlinePool:
+    """ProcessPoolExecutor stand-in: workers can't see the test database."""
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        _InlinePool.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def map(self, fn, items, **kwargs):
+        return map(fn, items)
+
+
+class TestCertificateBatch(ReportTestBase):
+    """Tests for batch certificate export and the ZIP download."""
+
+    def setUp(self):
+        generate_certificate_number(self.test)
+        self.test.refresh_from_db()
+        self.other = Test.objects.create(
+            meter=self.meter, test_class='B', status='completed',
+            overall_pass=True, initiated_by=self.user,
+            certificate_number='IIITB-TEST-0002',
+        )
+
+    def test_prefetched_tests_render_without_queries(self):
+        tests = list(iter_tests_for_certs([self.test.pk, self.other.pk]))
+        with self.assertNumQueries(0):
+            for test in tests:
+                self.assertTrue(generate_certificate_pdf(test).startswith(b'%PDF'))
+
+    def test_summary_keeps_q_point_order_from_prefetch(self):
+        test = iter_tests_for_certs([self.test.pk]).get()
+        with self.assertNumQueries(0):
+            summary = get_test_summary(test)
+        self.assertEqual([qp.q_point for qp in summary.q_points],
+                         [f'Q{i}' for i in range(1, 9)])
+
+    def test_bulk_save_in_order(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with self.settings(MEDIA_ROOT=tmpdir):
+                paths = save_certificates_bulk([self.other.pk, self.test.pk], max_workers=1)
+                for path in paths:
+                    self.assertTrue(os.path.exists(os.path.join(tmpdir, path)))
+        self.assertEqual(paths[0], 'certificates/IIITB-TEST-0002.pdf')
+        self.other.refresh_from_db()
+        self.assertEqual(self.other.certificate_pdf, paths[0])
+
+    def test_bulk_save_fans_out_to_process_pool(self):
+        _InlinePool.instances.clear()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with self.settings(MEDIA_ROOT=tmpdir):
+                with patch('reports.generator.ProcessPoolExecutor', _InlinePool):
+                    paths = save_certificates_bulk([self.test.pk, self.other.pk], max_workers=4)
+        self.assertEqual(len(paths), 2)
+        self.assertEqual(_InlinePool.instances[0].kwargs['max_workers'], 2)
+
+    def test_export_all_certificates_command(self):
+        from io import StringIO
+        from django.core.management import call_command
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with self.settings(MEDIA_ROOT=tmpdir, CERT_BATCH_WORKERS=1):
+                call_command('export_all_certificates', stdout=out)
+                self.assertIn('Exported 2 certificates', out.getvalue())
+                call_command('export_all_certificates', '--missing', stdout=out)
+        self.assertIn('No certificates to export', out.getvalue())
+
+    def test_combined_pdf_one_certificate_per_page_run(self):
+        from reportlab.lib.pagesizes import A4
+        tests = list(iter_tests_for_certs([self.test.pk, self.other.pk]))
+        combined = generate_certificates_pdf(tests)
+        self.assertTrue(combined.startswith(b'%PDF'))
+        single = generate_certificate_pdf(tests[0])
+        self.assertGreater(combined.count(b'/Type /Page\n'), single.count(b'/Type /Page\n'))
+
+    def test_export_combined_pdf(self):
+        from io import StringIO
+        from django.core.management import call_command
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'pack.pdf')
+            call_command('export_all_certificates', '--combined', path, stdout=StringIO())
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(4), b'%PDF')
+
+    def _download_zip(self, ids):
+        async def read():
+            resp = await self.async_client.get('/tests/certificates.zip', {'ids': ids})
+            return resp, b''.join([chunk async for chunk in resp.streaming_content])
+
+        self.async_client.force_login(self.user)
+        return async_to_sync(read)()
+
+    def test_zip_download_serves_saved_only(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with self.settings(MEDIA_ROOT=tmpdir):
+                save_certificate(self.test)
+                with patch('reports.generator.generate_certificate_pdf') as render:
+                    resp, data = self._download_zip(f'{self.test.pk},{self.other.pk}')
+        render.assert_not_called()
+        self.assertEqual(resp['Content-Type'], 'application/zip')
+        self.assertTrue(resp.is_async)
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            self.assertEqual(zf.namelist(), [f'{self.test.certificate_number}.pdf', 'MISSING.txt'])
+            self.assertTrue(zf.read(zf.namelist()[0]).startswith(b'%PDF'))
+            missing = zf.read('MISSING.txt').decode()
+        self.assertIn(f'test ids: {self.other.pk}\n', missing)
+        self.assertIn('export_all_certificates --missing', missing)
+
+    def test_zip_download_all_saved_has_no_missing_note(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with self.settings(MEDIA_ROOT=tmpdir):
+                save_certificate(self.test)
+                _, data = self._download_zip(str(self.test.pk))
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            self.assertEqual(zf.namelist(), [f'{self.test.certificate_number}.pdf'])
+
+    def test_zip_download_404_without_saved_certificates(self):
+        self.client.force_login(self.user)
+        resp = self.client.get('/tests/certificates.zip', {'ids': f'99999,{self.other.pk}'})
+        self.assertEqual(resp.status_code, 404)
@@ -6,6 +6,8 @@ Usage:
     ref_volume = net_weight / density
 """
 
+from functools import lru_cache
+
 # ISO 4064 Annex — Water density (kg/L) at various temperatures (°C)
 # at standard atmospheric pressure (101.325 kPa).
 DENSITY_TABLE = {
@@ -49,11 +51,14 @@ DENSITY_TABLE = {
 }
 
 
+@lru_cache(maxsize=128)
 def water_density(temperature_c: float) -> float:
     """Return water density in kg/L for a given temperature (°C).
 
     Uses linear interpolation between the nearest integer values
     from the ISO 4064 density table. Clamps to 4–40°C range.
+    Cached on the exact temperature (a test run repeats a handful of
+    readings), so results are identical to the uncached lookup.
     """
     temp = max(4.0, min(40.0, temperature_c))
     lower = int(temp)
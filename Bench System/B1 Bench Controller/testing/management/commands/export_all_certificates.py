@@ -0,0 +1,58 @@
+"""
+Regenerate certificate PDFs for every certified test.
+
+Rendering fans out across CPU cores (see reports.generator.save_certificates_bulk).
+
+Usage:
+    python manage.py export_all_certificates              # All certified tests
+    python manage.py export_all_certificates --missing    # Only tests without a saved PDF
+    python manage.py export_all_certificates --workers 4
+    python manage.py export_all_certificates --combined pack.pdf  # One PDF for printing
+"""
+
+from django.core.management.base import BaseCommand
+
+from testing.models import Test
+
+
+class Command(BaseCommand):
+    help = 'Regenerate certificate PDFs for all certified tests'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--missing', action='store_true',
+            help='Only generate certificates that have not been saved yet',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='Worker processes. Default: CERT_BATCH_WORKERS or CPU count',
+        )
+        parser.add_argument(
+            '--combined', metavar='PATH',
+            help='Write all certificates into a single PDF at PATH instead',
+        )
+
+    def handle(self, *args, **options):
+        from reports.generator import (
+            generate_certificates_pdf, iter_tests_for_certs, save_certificates_bulk,
+        )
+
+        qs = Test.objects.filter(certificate_number__gt='')
+        if options['missing']:
+            qs = qs.filter(certificate_pdf='')
+        test_ids = list(qs.order_by('-completed_at').values_list('pk', flat=True))
+        if not test_ids:
+            self.stdout.write('No certificates to export.')
+            return
+
+        if options['combined']:
+            tests = {t.pk: t for t in iter_tests_for_certs(test_ids)}
+            with open(options['combined'], 'wb') as f:
+                generate_certificates_pdf((tests[pk] for pk in test_ids), out=f)
+            self.stdout.write(self.style.SUCCESS(
+                f"Wrote {len(test_ids)} certificates to {options['combined']}."
+            ))
+            return
+
+        paths = save_certificates_bulk(test_ids, max_workers=options['workers'])
+        self.stdout.write(self.style.SUCCESS(f'Exported {len(paths)} certificates.'))
@@ -97,14 +97,16 @@ class Command(BaseCommand):
         iso_params = ISO4064Standard.objects.filter(
             meter_size=meter_size, meter_class=meter_class,
         ).order_by('q_point')
-        for p in iso_params:
-            TestResult.objects.create(
+        TestResult.objects.bulk_create([
+            TestResult(
                 test=test,
                 q_point=p.q_point,
                 target_flow_lph=p.flow_rate_lph,
                 mpe_pct=p.mpe_pct,
                 zone=p.zone,
             )
+            for p in iso_params
+        ])
 
         self.stdout.write(self.style.SUCCESS(
             f"  Test #{test.pk}, meter {meter.serial_number}"
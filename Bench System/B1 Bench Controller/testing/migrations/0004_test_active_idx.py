@@ -0,0 +1,17 @@
+# Generated by Django 5.0 on 2026-10-15 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testing', '0003_alter_iso4064standard_meter_class_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='test',
+            index=models.Index(condition=models.Q(('status__in', ['running', 'queued', 'acknowledged'])), fields=['status'], name='test_active_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0 on 2026-10-15 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testing', '0004_test_active_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='test',
+            index=models.Index(fields=['-created_at'], name='test_created_desc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='test',
+            index=models.Index(fields=['-completed_at'], name='test_completed_desc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='test',
+            index=models.Index(condition=models.Q(('certificate_number__gt', '')), fields=['-completed_at'], name='test_cert_idx'),
+        ),
+    ]
@@ -81,6 +81,22 @@ class Test(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Partial: only in-flight tests, so it stays tiny as history grows
+            models.Index(
+                fields=['status'], name='test_active_idx',
+                condition=models.Q(status__in=['running', 'queued', 'acknowledged']),
+            ),
+            # Sort keys for the test history listing/CSV export and
+            # completion-ordered views
+            models.Index(fields=['-created_at'], name='test_created_desc_idx'),
+            models.Index(fields=['-completed_at'], name='test_completed_desc_idx'),
+            # Certificates listing: certificate_number__gt='' ordered by -completed_at
+            models.Index(
+                fields=['-completed_at'], name='test_cert_idx',
+                condition=models.Q(certificate_number__gt=''),
+            ),
+        ]
 
     def __str__(self):
         return f"Test #{self.pk} - {self.meter.serial_number} ({self.get_status_display()})"
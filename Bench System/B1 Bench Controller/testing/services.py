@@ -5,6 +5,8 @@ and certificate generation. Used by both the test engine (controller app)
 and the web views.
 """
 from dataclasses import dataclass, field
+from enum import Enum
+from django.core.cache import cache
 from django.utils import timezone
 
 from testing.models import Test, TestResult
@@ -15,9 +17,24 @@ from testing.iso4064 import water_density, calculate_error, check_pass
 #  Exceptions
 # ---------------------------------------------------------------------------
 
+class ValidationCode(Enum):
+    WEIGHT_NOT_POSITIVE = 'WEIGHT_NOT_POSITIVE'
+    TEMPERATURE_OUT_OF_RANGE = 'TEMPERATURE_OUT_OF_RANGE'
+    DUT_VOLUME_NEGATIVE = 'DUT_VOLUME_NEGATIVE'
+    DURATION_NOT_POSITIVE = 'DURATION_NOT_POSITIVE'
+    GRAVIMETRIC_FAILED = 'GRAVIMETRIC_FAILED'
+
+
 class MeasurementValidationError(Exception):
-    """Raised when measurement inputs fail validation."""
-    pass
+    """Raised when measurement inputs fail validation.
+
+    ``code`` identifies the failed check, so callers can branch on it
+    without parsing the (human-readable) message.
+    """
+
+    def __init__(self, message: str, code: ValidationCode | None = None):
+        super().__init__(message)
+        self.code = code
 
 
 # ---------------------------------------------------------------------------
@@ -37,19 +54,23 @@ def validate_measurement_inputs(
     """
     if ref_weight_kg <= 0:
         raise MeasurementValidationError(
-            f"Reference weight must be positive, got {ref_weight_kg} kg"
+            f"Reference weight must be positive, got {ref_weight_kg} kg",
+            ValidationCode.WEIGHT_NOT_POSITIVE,
         )
     if not (1.0 <= temperature_c <= 50.0):
         raise MeasurementValidationError(
-            f"Water temperature must be 1-50°C, got {temperature_c}°C"
+            f"Water temperature must be 1-50°C, got {temperature_c}°C",
+            ValidationCode.TEMPERATURE_OUT_OF_RANGE,
         )
     if dut_volume_l < 0:
         raise MeasurementValidationError(
-            f"DUT volume cannot be negative, got {dut_volume_l} L"
+            f"DUT volume cannot be negative, got {dut_volume_l} L",
+            ValidationCode.DUT_VOLUME_NEGATIVE,
         )
     if duration_s is not None and duration_s <= 0:
         raise MeasurementValidationError(
-            f"Duration must be positive, got {duration_s} s"
+            f"Duration must be positive, got {duration_s} s",
+            ValidationCode.DURATION_NOT_POSITIVE,
         )
 
 
@@ -63,7 +84,7 @@ def start_test(test: Test) -> None:
     test.started_at = timezone.now()
     test.current_q_point = 'Q1'
     test.current_state = 'PRE_CHECK'
-    test.save()
+    test.save(update_fields=['status', 'started_at', 'current_q_point', 'current_state'])
 
 
 def update_test_state(test: Test, q_point: str, state: str) -> None:
@@ -113,19 +134,22 @@ def record_result(
     result.temperature_c = temperature_c
     result.duration_s = duration_s
     result.weight_kg = round(ref_weight_kg, 4)
-    result.save()
+    result.save(update_fields=[
+        'ref_volume_l', 'dut_volume_l', 'error_pct', 'passed', 'actual_flow_lph',
+        'pressure_up_bar', 'pressure_dn_bar', 'temperature_c', 'duration_s', 'weight_kg',
+    ])
     return result
 
 
 def complete_test(test: Test) -> None:
     """Finalize a test after all Q-points are done."""
-    results = test.results.all()
-    all_passed = all(r.passed for r in results if r.passed is not None)
+    # Pass unless some measured point failed (unmeasured points don't count);
+    # an EXISTS stops at the first failure instead of loading every row
     test.status = 'completed'
-    test.overall_pass = all_passed
+    test.overall_pass = not test.results.filter(passed=False).exists()
     test.completed_at = timezone.now()
     test.current_state = 'COMPLETE'
-    test.save()
+    test.save(update_fields=['status', 'overall_pass', 'completed_at', 'current_state'])
 
 
 def abort_test(test: Test, reason: str = '') -> None:
@@ -134,7 +158,7 @@ def abort_test(test: Test, reason: str = '') -> None:
     test.completed_at = timezone.now()
     test.current_state = 'EMERGENCY_STOP'
     test.notes = f"Aborted: {reason}" if reason else "Aborted"
-    test.save()
+    test.save(update_fields=['status', 'completed_at', 'current_state', 'notes'])
 
 
 def generate_certificate_number(test: Test) -> str:
@@ -183,7 +207,8 @@ def process_q_point_result(
     """
     if not gravimetric_result.success:
         raise MeasurementValidationError(
-            f"Gravimetric measurement failed: {gravimetric_result.error_message}"
+            f"Gravimetric measurement failed: {gravimetric_result.error_message}",
+            ValidationCode.GRAVIMETRIC_FAILED,
         )
 
     return record_result(
@@ -202,9 +227,13 @@ def process_q_point_result(
 #  Test summary — for UI, reports, certificate, LoRa transmission
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class QPointSummary:
-    """Summary of a single Q-point result for UI display."""
+    """Summary of a single Q-point result for UI display.
+
+    Slotted: built for every point of every summary, and never given
+    extra attributes.
+    """
     q_point: str = ''
     zone: str = ''
     target_flow_lph: float = 0.0
@@ -256,15 +285,21 @@ def get_test_summary(test: Test) -> TestSummary:
     Returns a TestSummary dataclass with zone-level verdicts,
     error statistics, and per-point details.
     """
-    results = list(test.results.all().order_by('q_point'))
+    # Sorted in Python rather than .order_by() so a prefetched
+    # test.results (see reports.generator.iter_tests_for_certs) is reused
+    results = sorted(test.results.all(), key=lambda r: r.q_point)
 
+    # One pass for the per-point rows and every aggregate. Not a SQL
+    # aggregate: the rows are needed anyway, and may already be prefetched.
     q_summaries = []
-    errors = []
-    lower_results = []
-    upper_results = []
+    error_count = 0
+    error_sum = 0.0
+    min_error = max_error = None
+    passed_points = failed_points = 0
+    lower_pass = upper_pass = None
 
     for r in results:
-        qs = QPointSummary(
+        q_summaries.append(QPointSummary(
             q_point=r.q_point,
             zone=r.zone,
             target_flow_lph=r.target_flow_lph,
@@ -276,18 +311,26 @@ def get_test_summary(test: Test) -> TestSummary:
             passed=r.passed,
             temperature_c=r.temperature_c,
             weight_kg=r.weight_kg,
-        )
-        q_summaries.append(qs)
-
-        if r.error_pct is not None:
-            errors.append(r.error_pct)
-
-        if r.zone == 'Lower' and r.passed is not None:
-            lower_results.append(r.passed)
-        elif r.zone == 'Upper' and r.passed is not None:
-            upper_results.append(r.passed)
-
-    completed = [r for r in results if r.passed is not None]
+        ))
+
+        err = r.error_pct
+        if err is not None:
+            error_count += 1
+            error_sum += err
+            if min_error is None or err < min_error:
+                min_error = err
+            if max_error is None or err > max_error:
+                max_error = err
+
+        if r.passed is not None:
+            if r.passed:
+                passed_points += 1
+            else:
+                failed_points += 1
+            if r.zone == 'Lower':
+                lower_pass = r.passed and lower_pass is not False
+            elif r.zone == 'Upper':
+                upper_pass = r.passed and upper_pass is not False
 
     summary = TestSummary(
         test_id=test.pk,
@@ -299,15 +342,15 @@ def get_test_summary(test: Test) -> TestSummary:
         started_at=test.started_at.isoformat() if test.started_at else '',
         completed_at=test.completed_at.isoformat() if test.completed_at else '',
         certificate_number=test.certificate_number,
-        lower_zone_pass=all(lower_results) if lower_results else None,
-        upper_zone_pass=all(upper_results) if upper_results else None,
-        min_error_pct=round(min(errors), 3) if errors else None,
-        max_error_pct=round(max(errors), 3) if errors else None,
-        avg_error_pct=round(sum(errors) / len(errors), 3) if errors else None,
+        lower_zone_pass=lower_pass,
+        upper_zone_pass=upper_pass,
+        min_error_pct=round(min_error, 3) if error_count else None,
+        max_error_pct=round(max_error, 3) if error_count else None,
+        avg_error_pct=round(error_sum / error_count, 3) if error_count else None,
         total_points=len(results),
-        completed_points=len(completed),
-        passed_points=sum(1 for r in completed if r.passed),
-        failed_points=sum(1 for r in completed if not r.passed),
+        completed_points=passed_points + failed_points,
+        passed_points=passed_points,
+        failed_points=failed_points,
         q_points=q_summaries,
     )
     return summary
@@ -317,6 +360,25 @@ def get_test_summary(test: Test) -> TestSummary:
 #  Sensor reading helper — creates bench_ui.SensorReading from SensorSnapshot
 # ---------------------------------------------------------------------------
 
+# Latest-reading snapshot for live monitor polling (bypasses the DB)
+SENSOR_CACHE_TTL = 10  # seconds — stale once the producer stops
+
+
+def sensor_cache_key(test_id: int) -> str:
+    return f'sensor:last:{test_id}'
+
+
+def sensor_payload(reading) -> dict:
+    """Live-monitor sensor dict for a SensorReading."""
+    return {
+        'flow_rate_lph': reading.flow_rate_lph,
+        'pressure_bar': reading.pressure_upstream_bar,
+        'weight_kg': reading.weight_kg,
+        'temperature_c': reading.water_temp_c,
+        'vfd_freq_hz': reading.vfd_freq_hz,
+    }
+
+
 def record_sensor_reading(test: Test, snapshot, q_point: str = '',
                           trigger: str = 'periodic', event_label: str = '',
                           diverter: str = 'BYPASS', active_lane: str = ''):
@@ -331,7 +393,7 @@ def record_sensor_reading(test: Test, snapshot, q_point: str = '',
     except ImportError:
         return None
 
-    return SensorReading.objects.create(
+    reading = SensorReading.objects.create(
         test=test,
         timestamp=timezone.now(),
         q_point=q_point,
@@ -349,6 +411,8 @@ def record_sensor_reading(test: Test, snapshot, q_point: str = '',
         diverter=diverter,
         active_lane=active_lane,
     )
+    cache.set(sensor_cache_key(test.pk), sensor_payload(reading), SENSOR_CACHE_TTL)
+    return reading
 
 
 # ---------------------------------------------------------------------------
@@ -10,5 +10,6 @@ urlpatterns = [
     path('create/', views.test_create, name='test_create'),
     path('<int:pk>/approve/', views.test_approve, name='test_approve'),
     path('<int:pk>/certificate/', views.download_certificate, name='download_certificate'),
+    path('certificates.zip', views.download_certificates_zip, name='download_certificates_zip'),
     path('<int:pk>/status/', views.test_results_api, name='test_results_api'),
 ]
@@ -1,8 +1,10 @@
 import os
+import zipfile
 
+from asgiref.sync import sync_to_async
 from django.conf import settings as django_settings
 from django.contrib.auth.decorators import login_required
-from django.http import FileResponse, Http404
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.utils import timezone
@@ -135,19 +137,21 @@ def test_create(request):
             source='bench',
         )
 
-        # Auto-populate Q-point result placeholders from ISO 4064
+        # Auto-populate Q-point result placeholders in one INSERT
         q_points = ISO4064Standard.objects.filter(
             meter_size=meter.meter_size,
             meter_class=test_class,
         )
-        for qp in q_points:
-            TestResult.objects.create(
+        TestResult.objects.bulk_create([
+            TestResult(
                 test=test,
                 q_point=qp.q_point,
                 target_flow_lph=qp.flow_rate_lph,
                 mpe_pct=qp.mpe_pct,
                 zone=qp.zone,
             )
+            for qp in q_points
+        ])
 
         messages.success(request, f"Test #{test.pk} created for {meter.serial_number} ({test_class}).")
         try:
@@ -235,6 +239,87 @@ def test_results_api(request, pk):
     })
 
 
+MAX_CERTIFICATE_BATCH = 500
+
+
+@login_required
+def download_certificates_zip(request):
+    """Download a ZIP of the saved certificate PDFs for ?ids=1,2,3 (streamed).
+
+    Only serves files already in MEDIA_ROOT; rendering is left to
+    save_certificate() and `manage.py export_all_certificates --missing`,
+    never done on the request path. Tests without a saved PDF are listed
+    in a MISSING.txt member rather than silently left out.
+    """
+    from reports.generator import certificate_filename
+
+    try:
+        ids = [int(i) for i in request.GET.get('ids', '').split(',') if i.strip()]
+    except ValueError:
+        raise Http404("Invalid test ids.")
+    ids = ids[:MAX_CERTIFICATE_BATCH]
+
+    saved, served = [], set()
+    tests = Test.objects.filter(
+        pk__in=ids, certificate_number__gt='', certificate_pdf__gt='',
+    ).only('pk', 'certificate_number', 'certificate_pdf')
+    for test in tests:
+        filepath = os.path.join(django_settings.MEDIA_ROOT, test.certificate_pdf)
+        if os.path.isfile(filepath):
+            saved.append((certificate_filename(test), filepath))
+            served.add(test.pk)
+    if not saved:
+        raise Http404(
+            "No saved certificates for these tests; "
+            "run `manage.py export_all_certificates --missing` to render them."
+        )
+
+    missing = [test_id for test_id in dict.fromkeys(ids) if test_id not in served]
+    note = (
+        f"No saved certificate for test ids: {', '.join(map(str, missing))}\n"
+        "Run `manage.py export_all_certificates --missing` to render them.\n"
+    ) if missing else None
+
+    response = StreamingHttpResponse(_zip_stream(saved, note), content_type='application/zip')
+    response['Content-Disposition'] = 'attachment; filename="certificates.zip"'
+    return response
+
+
+class _ZipSink:
+    """Write-only, non-seekable sink so ZipFile output can be streamed."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data, self.chunks = b''.join(self.chunks), []
+        return data
+
+
+async def _zip_stream(files, missing_note=None):
+    """Yield ZIP bytes for (name, filepath) pairs, one member at a time.
+
+    Async so ASGI sends each member as it is written; Django reads a
+    sync iterator to the end first. PDFs are already deflate-compressed,
+    so members are stored as-is. A missing_note is added as MISSING.txt.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_STORED) as zf:
+        for name, filepath in files:
+            await sync_to_async(zf.write)(filepath, arcname=name)
+            yield sink.drain()
+        if missing_note:
+            zf.writestr('MISSING.txt', missing_note)
+    yield sink.drain()
+
+
 @login_required
 def download_certificate(request, pk):
     """Download a test certificate PDF."""